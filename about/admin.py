@@ -1,6 +1,7 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from .models import About, CollaborateRequest
 from django_summernote.admin import SummernoteModelAdmin
+from codestar.admin import ScalableChangelistMixin
 
 
 # Register your models here.
@@ -11,6 +12,23 @@ class AboutAdmin(SummernoteModelAdmin):
 
 
 @admin.register(CollaborateRequest)
-class CollaborateRequestAdmin(admin.ModelAdmin):
+class CollaborateRequestAdmin(ScalableChangelistMixin, admin.ModelAdmin):
+    """
+    The collaboration request inbox, unread and newest first.
 
-    list_display = ("message", "read")
+    Messages are only loaded by the change form.
+    """
+
+    list_display = ("name", "email", "read")
+    changelist_fields = list_display
+    list_filter = ("read",)
+    ordering = ("read", "-id")
+    actions = ["mark_as_read"]
+
+    @admin.action(
+        description="Mark selected requests as read", permissions=["change"]
+    )
+    def mark_as_read(self, request, queryset):
+        updated = queryset.filter(read=False).update(read=True)
+        message = f"{updated} collaboration requests marked as read."
+        self.message_user(request, message, messages.SUCCESS)
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class AboutConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'about'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from codestar.page_cache import watch_models
+        from .cache import invalidate_about
+        from .models import About
+
+        watch_models(About)
+        post_save.connect(invalidate_about, sender=About)
+        post_delete.connect(invalidate_about, sender=About)
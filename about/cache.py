@@ -0,0 +1,69 @@
+"""
+A process-local cache of the current About content.
+
+The About record changes rarely, so each worker keeps the current record in
+memory, tagged with the version published in the "pages" cache when it was
+loaded. A worker whose copy has a different tag reloads the record. Saving
+or deleting About content publishes a new version once the change commits.
+
+The version expires after `settings.ABOUT_CACHE_TIMEOUT` seconds. When the
+"pages" cache is shared by every server, changes show straight away; with
+the default file backend, which is local to a dyno, other dynos show a
+change once their version expires.
+"""
+
+import uuid
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from codestar.page_cache import CACHE_ALIAS
+from .models import About
+
+VERSION_KEY = "about:version"
+# Maps "about" to a tuple of the version the record was loaded under and the
+# record itself.
+_local = {}
+
+
+def _new_version():
+    return uuid.uuid4().hex
+
+
+def current_about():
+    """
+    Return the latest About content, usually without a database query.
+
+    The version is read before the record, so a record loaded while a
+    change commits is tagged with the version the change replaces.
+
+    Returns:
+        :model:`about.About`: The latest About content, or None if there
+        isn't any.
+    """
+    version = caches[CACHE_ALIAS].get_or_set(
+        VERSION_KEY, _new_version, timeout=settings.ABOUT_CACHE_TIMEOUT
+    )
+    cached = _local.get("about")
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    about = About.objects.first()
+    _local["about"] = (version, about)
+    return about
+
+
+def invalidate_about(**kwargs):
+    """
+    Make every worker reload the About content.
+
+    A new version is published straight away and again when the transaction
+    commits, so a record loaded before the commit is reloaded after it.
+    Accepts and ignores signal arguments, so it can be used as a receiver.
+    """
+
+    def publish():
+        caches[CACHE_ALIAS].set(
+            VERSION_KEY, _new_version(), timeout=settings.ABOUT_CACHE_TIMEOUT
+        )
+
+    publish()
+    transaction.on_commit(publish)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from about import spool
+
+
+class Command(BaseCommand):
+    """
+    Save the collaboration requests waiting in the write-behind spool.
+
+    Run this after a deploy or crash, or on a schedule when
+    `settings.COLLABORATE_FLUSH_INTERVAL` is 0.
+
+    Models:
+        :model:`about.CollaborateRequest`
+    """
+
+    help = "Save spooled collaboration requests to the database in bulk."
+
+    def handle(self, *args, **options):
+        saved = spool.drain()
+        message = f"Saved {saved} collaboration requests."
+        self.stdout.write(self.style.SUCCESS(message))
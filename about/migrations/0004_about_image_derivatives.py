@@ -0,0 +1,18 @@
+# Generated by Django 4.2.25 on 2026-10-18 08:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('about', '0003_about_profile_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='about',
+            name='image_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
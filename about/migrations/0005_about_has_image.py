@@ -0,0 +1,28 @@
+# Generated by Django 4.2.25 on 2026-10-18 08:16
+
+from django.db import migrations, models
+
+
+def mark_uploaded_images(apps, schema_editor):
+    About = apps.get_model('about', 'About')
+    About.objects.exclude(profile_image__contains='placeholder').exclude(
+        profile_image=''
+    ).update(has_image=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('about', '0004_about_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='about',
+            name='has_image',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(
+            mark_uploaded_images, migrations.RunPython.noop
+        ),
+    ]
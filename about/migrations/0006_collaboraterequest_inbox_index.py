@@ -0,0 +1,17 @@
+# Generated by Django 4.2.25 on 2026-10-18 08:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('about', '0005_about_has_image'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='collaboraterequest',
+            index=models.Index(fields=['read', '-id'], name='about_collab_inbox_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from cloudinary.models import CloudinaryField
 from django.db import models
+from codestar.images import refresh_derivatives
 
 
 class About(models.Model):
@@ -10,10 +11,25 @@ class About(models.Model):
     profile_image = CloudinaryField("image", default="placeholder")
     content = models.TextField()
     updated_on = models.DateTimeField(auto_now=True)
+    has_image = models.BooleanField(default=False, editable=False)
+    image_derivatives = models.JSONField(
+        default=dict, blank=True, editable=False
+    )
+
+    # The name of the image field whose derivatives are stored.
+    image_field = "profile_image"
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """
+        Save the content, making the profile image's derivatives once, when
+        a new image is saved.
+        """
+        super().save(*args, **kwargs)
+        refresh_derivatives(self, ("profile",))
+
     class Meta:
         ordering = ["-updated_on"]
 
@@ -27,5 +43,13 @@ class CollaborateRequest(models.Model):
     message = models.TextField()
     read = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Serves the admin inbox, which lists unread requests first.
+            models.Index(
+                fields=["read", "-id"], name="about_collab_inbox_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"Collaboration request from {self.name}"
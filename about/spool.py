@@ -0,0 +1,145 @@
+"""
+A write-behind queue for collaboration requests.
+
+When `settings.COLLABORATE_WRITE_BEHIND` is on, validated requests are
+appended to a local spool file and acknowledged straight away. A background
+thread in each worker, or the `drain_collaborate_spool` command, later saves
+everything in the spool with one `bulk_create`. Queuing only waits for
+other appends, never for a drain's database write.
+
+The spool is only deleted after its rows are saved, so requests survive a
+crash or a failed database write. Rows are saved at least once: a crash
+between saving and deleting a spool saves its rows again on the next drain.
+"""
+
+import fcntl
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import connection, transaction
+from .models import CollaborateRequest
+
+logger = logging.getLogger(__name__)
+
+_wake = threading.Event()
+_start_lock = threading.Lock()
+_flusher = None
+
+
+@contextmanager
+def _locked(name="lock"):
+    """
+    Hold an exclusive lock shared by every process.
+
+    Args:
+        name (str): The lock's name. The "lock" lock guards the spool itself
+            and is only held briefly; the "drain" lock lets one drain run at
+            a time.
+    """
+    path = settings.COLLABORATE_SPOOL_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.{name}", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield path
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def enqueue(cleaned_data):
+    """
+    Durably append a validated collaboration request to the spool.
+
+    Args:
+        cleaned_data (dict): :form:`about.CollaborateForm` cleaned data.
+    """
+    fields = ("name", "email", "message")
+    line = json.dumps({field: cleaned_data[field] for field in fields})
+    with _locked() as path:
+        with open(path, "a") as spool:
+            spool.write(f"{line}\n")
+            spool.flush()
+            os.fsync(spool.fileno())
+    _start_flusher()
+    _wake.set()
+
+
+def drain():
+    """
+    Save every spooled collaboration request to the database.
+
+    The spool is renamed into a batch file while locked, then the lock is
+    released before the batch is saved, so requests keep being queued while
+    the database write runs. Batches left by an earlier failed drain are
+    saved too.
+
+    Returns:
+        int: The number of collaboration requests saved.
+    """
+    with _locked("drain"):
+        with _locked() as path:
+            if os.path.exists(path):
+                batch_path = f"{path}.{os.getpid()}.{time.time_ns()}.drain"
+                os.replace(path, batch_path)
+        saved = 0
+        for batch_path in sorted(glob.glob(f"{glob.escape(path)}.*.drain")):
+            with open(batch_path) as batch:
+                requests = [
+                    CollaborateRequest(**json.loads(line), read=False)
+                    for line in batch
+                    if line.strip()
+                ]
+            with transaction.atomic():
+                CollaborateRequest.objects.bulk_create(requests)
+            os.remove(batch_path)
+            saved += len(requests)
+    return saved
+
+
+def _flush_forever():
+    """
+    Drain the spool whenever a request is queued, at most once per
+    `settings.COLLABORATE_FLUSH_INTERVAL` seconds.
+    """
+    while True:
+        _wake.wait()
+        time.sleep(settings.COLLABORATE_FLUSH_INTERVAL)
+        _wake.clear()
+        _flush()
+
+
+def _flush():
+    """
+    Drain the spool, logging a failure and trying again after the interval.
+    """
+    try:
+        drain()
+    except Exception:
+        # The spool is kept, so the requests are saved by a later drain.
+        logger.exception("Couldn't save spooled collaboration requests.")
+        _wake.set()
+    finally:
+        connection.close()
+
+
+def _start_flusher():
+    """
+    Start this process's background flusher thread if it isn't running.
+
+    No thread is started if `settings.COLLABORATE_FLUSH_INTERVAL` is 0, in
+    which case the spool is only drained by the management command.
+    """
+    global _flusher
+    if settings.COLLABORATE_FLUSH_INTERVAL <= 0:
+        return
+    with _start_lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(
+                target=_flush_forever, name="collaborate-spool", daemon=True
+            )
+            _flusher.start()
@@ -0,0 +1,50 @@
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from .models import CollaborateRequest
+
+
+class TestCollaborateRequestAdmin(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_superuser(
+            username="owner", password="myPassword"
+        )
+        self.client.force_login(user)
+        self.requests = CollaborateRequest.objects.bulk_create(
+            CollaborateRequest(
+                name=f"Name {index}",
+                email=f"person{index}@example.com",
+                message="A long message",
+            )
+            for index in range(3)
+        )
+        self.changelist = reverse("admin:about_collaboraterequest_changelist")
+
+    def test_changelist_lists_unread_first_without_messages(self):
+        CollaborateRequest.objects.filter(pk=self.requests[2].pk).update(
+            read=True
+        )
+        response = self.client.get(self.changelist)
+        results = list(response.context["cl"].result_list)
+        self.assertEqual(
+            [request.name for request in results],
+            ["Name 1", "Name 0", "Name 2"],
+        )
+        self.assertIn("message", results[0].get_deferred_fields())
+
+    def test_mark_as_read_action(self):
+        response = self.client.post(
+            self.changelist,
+            {
+                "action": "mark_as_read",
+                ACTION_CHECKBOX_NAME: [
+                    request.pk for request in self.requests
+                ],
+            },
+            follow=True,
+        )
+        self.assertContains(response, "3 collaboration requests marked")
+        unread = CollaborateRequest.objects.filter(read=False)
+        self.assertFalse(unread.exists())
@@ -1,8 +1,21 @@
+import math
+import os
+import tempfile
+from io import StringIO
 from http import HTTPStatus
-from django.test import TestCase
+from unittest import mock
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from codestar.page_cache import CACHE_ALIAS
+from codestar.ratelimit import LocalBuckets
+from . import spool
+from .cache import VERSION_KEY, current_about
 from .forms import CollaborateForm
-from .models import About
+from .models import About, CollaborateRequest
 
 
 class TestAboutView(TestCase):
@@ -36,3 +49,226 @@ class TestAboutView(TestCase):
             "within 2 working days."
         )
         self.assertIn(bytes(success_message, "UTF-8"), response.content)
+
+    def test_anonymous_collaborate_request_does_not_use_sessions(self):
+        collaborate_form_data = {
+            "name": "Test name",
+            "email": "test@example.com",
+            "message": "Test message",
+        }
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(
+                reverse(self.about_view_path), collaborate_form_data
+            )
+        for query in queries.captured_queries:
+            self.assertNotIn("django_session", query["sql"])
+        self.assertNotIn("sessionid", self.client.cookies)
+
+    def test_unchanged_about_page_is_not_modified(self):
+        # The first response sets the CSRF cookie, which is part of the ETag.
+        self.client.get(reverse(self.about_view_path))
+        response = self.client.get(reverse(self.about_view_path))
+        self.assertNotIn("Last-Modified", response.headers)
+        response = self.client.get(
+            reverse(self.about_view_path),
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_about_page_renders_without_queries_when_cached(self):
+        self.client.get(reverse(self.about_view_path))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse(self.about_view_path))
+        self.assertIn(bytes(self.about.title, "UTF-8"), response.content)
+
+    def test_saving_about_content_invalidates_cache(self):
+        self.client.get(reverse(self.about_view_path))
+        self.about.title = "New about title"
+        self.about.save()
+        response = self.client.get(reverse(self.about_view_path))
+        self.assertIn(b"New about title", response.content)
+
+    def test_about_loaded_before_commit_is_reloaded_after(self):
+        current_about()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.about.title = "New about title"
+            self.about.save()
+            # Another worker loads the record before the change commits.
+            current_about()
+        with self.assertNumQueries(0):
+            current_about()
+        for callback in callbacks:
+            callback()
+        with self.assertNumQueries(1):
+            self.assertEqual(current_about().title, "New about title")
+
+    def test_about_version_expires(self):
+        current_about()
+        with self.assertNumQueries(0):
+            current_about()
+        caches[CACHE_ALIAS].delete(VERSION_KEY)
+        with self.assertNumQueries(1):
+            current_about()
+
+
+@override_settings(
+    RATE_LIMIT_ENABLED=True,
+    RATE_LIMIT_BACKEND="codestar.ratelimit.LocalBuckets",
+    RATE_LIMITS={"collaborate": (1, 600)},
+)
+class TestCollaborateRateLimit(TestCase):
+
+    def setUp(self):
+        LocalBuckets._buckets.clear()
+        self.addCleanup(LocalBuckets._buckets.clear)
+        pruned_at = mock.patch.object(LocalBuckets, "_pruned_at", -math.inf)
+        pruned_at.start()
+        self.addCleanup(pruned_at.stop)
+        self.form_data = {
+            "name": "Test name",
+            "email": "test@example.com",
+            "message": "Test message",
+        }
+
+    def test_over_limit_request_is_rejected_without_queries(self):
+        self.client.post(reverse("about-path"), self.form_data)
+        with self.assertNumQueries(0):
+            response = self.client.post(reverse("about-path"), self.form_data)
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertEqual(CollaborateRequest.objects.count(), 1)
+
+    def test_clients_have_separate_buckets(self):
+        self.client.post(
+            reverse("about-path"), self.form_data, REMOTE_ADDR="10.0.0.1"
+        )
+        response = self.client.post(
+            reverse("about-path"), self.form_data, REMOTE_ADDR="10.0.0.2"
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_clients_behind_heroku_router_have_separate_buckets(self):
+        """Test that clients are told apart by the router's forwarded hop"""
+
+        def post(forwarded_for):
+            return self.client.post(
+                reverse("about-path"),
+                self.form_data,
+                REMOTE_ADDR="10.1.0.1",
+                HTTP_X_FORWARDED_FOR=forwarded_for,
+            )
+
+        self.assertEqual(post("203.0.113.1").status_code, HTTPStatus.OK)
+        self.assertEqual(post("203.0.113.2").status_code, HTTPStatus.OK)
+        # A client can't escape its bucket by adding its own hops.
+        response = post("198.51.100.9, 203.0.113.1")
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+
+    def test_pruning_keeps_buckets_with_longer_periods(self):
+        """Test that a short scope's prune keeps other scopes' buckets"""
+
+        buckets = LocalBuckets()
+        with mock.patch.object(LocalBuckets, "MAX_BUCKETS", 2), mock.patch(
+            "codestar.ratelimit.time.monotonic"
+        ) as monotonic:
+            monotonic.return_value = 0
+            buckets.take("collaborate", 1, 600)
+            buckets.take("comment:1", 5, 60)
+            monotonic.return_value = 100
+            buckets.take("comment:2", 5, 60)
+            self.assertNotIn("comment:1", LocalBuckets._buckets)
+            self.assertGreater(buckets.take("collaborate", 1, 600), 0)
+
+    def test_pruning_is_rate_limited(self):
+        """Test that a full worker scans its buckets once per interval"""
+
+        buckets = LocalBuckets()
+        with mock.patch.object(LocalBuckets, "MAX_BUCKETS", 1), mock.patch(
+            "codestar.ratelimit.time.monotonic"
+        ) as monotonic, mock.patch.object(
+            LocalBuckets,
+            "_prune",
+            autospec=True,
+            side_effect=LocalBuckets._prune,
+        ) as prune:
+            monotonic.return_value = 0
+            buckets.take("comment:1", 5, 600)
+            for client in range(2, 10):
+                buckets.take(f"comment:{client}", 5, 600)
+            self.assertEqual(prune.call_count, 1)
+            monotonic.return_value = LocalBuckets.PRUNE_INTERVAL
+            buckets.take("comment:10", 5, 600)
+            self.assertEqual(prune.call_count, 2)
+
+
+class TestCollaborateWriteBehind(TestCase):
+
+    def setUp(self):
+        spool_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(spool_dir.cleanup)
+        self.spool_path = os.path.join(spool_dir.name, "collaborate.jsonl")
+        settings_override = override_settings(
+            COLLABORATE_WRITE_BEHIND=True,
+            COLLABORATE_SPOOL_PATH=self.spool_path,
+            COLLABORATE_FLUSH_INTERVAL=0,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.form_data = {
+            "name": "Test name",
+            "email": "test@example.com",
+            "message": "Test message",
+        }
+
+    def test_request_is_spooled_instead_of_saved(self):
+        response = self.client.post(reverse("about-path"), self.form_data)
+        self.assertContains(response, "Collaboration request received!")
+        self.assertFalse(CollaborateRequest.objects.exists())
+        with open(self.spool_path) as spool_file:
+            self.assertEqual(len(spool_file.readlines()), 1)
+
+    def test_invalid_request_is_not_spooled(self):
+        self.form_data["email"] = "not an email"
+        self.client.post(reverse("about-path"), self.form_data)
+        self.assertFalse(os.path.exists(self.spool_path))
+
+    def test_drain_command_saves_spooled_requests_in_bulk(self):
+        for _ in range(3):
+            self.client.post(reverse("about-path"), self.form_data)
+        with self.assertNumQueries(3):
+            call_command("drain_collaborate_spool", stdout=StringIO())
+        self.assertEqual(CollaborateRequest.objects.count(), 3)
+        self.assertFalse(CollaborateRequest.objects.filter(read=True).exists())
+        self.assertFalse(os.path.exists(self.spool_path))
+        call_command("drain_collaborate_spool", stdout=StringIO())
+        self.assertEqual(CollaborateRequest.objects.count(), 3)
+
+    def test_requests_queue_while_a_drain_saves(self):
+        self.client.post(reverse("about-path"), self.form_data)
+        bulk_create = CollaborateRequest.objects.bulk_create
+
+        def enqueue_then_save(requests):
+            # Would wait forever if the drain still held the spool's lock.
+            spool.enqueue(self.form_data)
+            return bulk_create(requests)
+
+        with mock.patch.object(
+            CollaborateRequest.objects,
+            "bulk_create",
+            side_effect=enqueue_then_save,
+        ):
+            self.assertEqual(spool.drain(), 1)
+        with open(self.spool_path) as spool_file:
+            self.assertEqual(len(spool_file.readlines()), 1)
+        self.assertEqual(spool.drain(), 1)
+        self.assertEqual(CollaborateRequest.objects.count(), 2)
+
+    def test_failed_background_drain_is_logged_and_retried(self):
+        spool._wake.clear()
+        self.addCleanup(spool._wake.clear)
+        with mock.patch.object(
+            spool, "drain", side_effect=DatabaseError
+        ), mock.patch.object(spool, "connection"), self.assertLogs(
+            "about.spool", "ERROR"
+        ):
+            spool._flush()
+        self.assertTrue(spool._wake.is_set())
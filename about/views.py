@@ -1,16 +1,50 @@
+from django.conf import settings
 from django.contrib import messages
 from django.shortcuts import render
+from . import spool
+from codestar.conditional import conditional_page
+from codestar.ratelimit import rate_limit
+from .cache import current_about
 from .forms import CollaborateForm
-from .models import About
+
+
+def _about_validators(request):
+    """
+    Return the values that identify the version of the About page.
+
+    Args:
+        request (HttpRequest): The request for the About page.
+
+    Models:
+        :model:`about.About`
+
+    Returns:
+        tuple:
+            The version values and None for the last modified datetime, or
+            None if there is no About content.
+    """
+    about = current_about()
+    if about is None:
+        return None
+    # No Last-Modified: it can't tell pages from before a deploy apart, so
+    # only the ETag, which includes the build ID, validates the page.
+    return (about.updated_on,), None
 
 
 # Create your views here.
+@rate_limit("collaborate")
+@conditional_page(_about_validators)
 def about_view(request):
     """
     Return the About page and save collaboration requests.
 
     Return the About page with the latest content. If this is a POST request,
     the user has submitted a collaboration request, so add it to the database.
+    Conditional requests from anonymous visitors are answered with 304 when
+    the content hasn't changed. The content comes from a process-local cache,
+    so the page usually renders without a database query. Collaboration
+    requests are rate limited per visitor, and over the limit a 429 response
+    is returned before the form is read.
 
     Args:
         request (HttpRequest):
@@ -34,9 +68,11 @@ def about_view(request):
         ERROR: If the attempt to save the collaborate request fails.
 
     Returns:
-        HttpResponse: Contains the about page.
+        HttpResponse:
+            Contains the about page, or a 429 response if the visitor has
+            sent too many collaboration requests.
     """
-    about = About.objects.first()
+    about = current_about()
     if request.method == "POST":
         _save_collaborate_request(request)
     collaborate_form = CollaborateForm()
@@ -51,6 +87,9 @@ def _save_collaborate_request(request):
     """
     Save a collaborate request to the database.
 
+    If `settings.COLLABORATE_WRITE_BEHIND` is on, the validated request is
+    added to the spool in :mod:`about.spool` and saved later in a batch.
+
     Args:
         request (HttpRequest):
             A POST request containing :form:`about.CollaborateForm` data.
@@ -64,9 +103,12 @@ def _save_collaborate_request(request):
     """
     collaboration_form = CollaborateForm(data=request.POST)
     if collaboration_form.is_valid():
-        collaboration_request = collaboration_form.save(commit=False)
-        collaboration_request.read = False
-        collaboration_request.save()
+        if settings.COLLABORATE_WRITE_BEHIND:
+            spool.enqueue(collaboration_form.cleaned_data)
+        else:
+            collaboration_request = collaboration_form.save(commit=False)
+            collaboration_request.read = False
+            collaboration_request.save()
         message = (
             "Collaboration request received! I endeavour to respond "
             "within 2 working days."
@@ -1,18 +1,80 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from .models import Comment, Post
 from django_summernote.admin import SummernoteModelAdmin
+from codestar.admin import ScalableChangelistMixin
+from codestar.page_cache import bump_content_version
+from .search import search_posts
 
 
 # Register your models here.
 
 
 @admin.register(Post)
-class PostAdmin(SummernoteModelAdmin):
+class PostAdmin(ScalableChangelistMixin, SummernoteModelAdmin):
     list_display = ("title", "slug", "status", "created_on")
-    search_fields = ["title", "content"]
+    changelist_fields = list_display
+    # Searched with the full-text index, not the field lookups.
+    search_fields = ["title"]
+    search_help_text = "Search titles, excerpts and content for words."
     list_filter = ("status", "created_on")
     prepopulated_fields = {"slug": ("title",)}
     summernote_fields = ("content",)
 
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Search posts with the full-text index instead of `icontains`.
+        """
+        if not search_term:
+            return queryset, False
+        return search_posts(queryset, search_term), False
 
-admin.site.register(Comment)
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    """
+    Moderation for comments.
+
+    The actions change every selected comment with one set-based query, then
+    recount the approved comments of the affected posts. Deleting keeps the
+    admin's confirmation page and history.
+    """
+
+    list_display = ("body", "post", "author", "approved", "created_on")
+    list_filter = ("approved", "created_on")
+    # The post column shows the post's author too.
+    list_select_related = ("post__author", "author")
+    # Skip the unfiltered COUNT query on every page of a long queue.
+    show_full_result_count = False
+    actions = ["approve_comments", "unapprove_comments"]
+
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .defer("post__content", "post__rendered_content")
+        )
+
+    def delete_queryset(self, request, queryset):
+        """
+        Delete the comments confirmed by the delete action in one query, then
+        recount the affected posts' approved comments.
+        """
+        queryset.delete_and_recount()
+        bump_content_version()
+
+    def _report(self, request, count, verb):
+        bump_content_version()
+        message = f"{count} comments {verb}."
+        self.message_user(request, message, messages.SUCCESS)
+
+    @admin.action(
+        description="Approve selected comments", permissions=["change"]
+    )
+    def approve_comments(self, request, queryset):
+        self._report(request, queryset.set_approved(True), "approved")
+
+    @admin.action(
+        description="Unapprove selected comments", permissions=["change"]
+    )
+    def unapprove_comments(self, request, queryset):
+        self._report(request, queryset.set_approved(False), "unapproved")
@@ -0,0 +1,226 @@
+"""
+A read-only JSON API for published posts and their approved comments.
+
+Responses only fetch the columns behind the requested fields, render no
+templates and never touch the session, so they are much cheaper than the
+HTML pages. Clients choose fields with `?fields=title,slug`, page with the
+`before` and `after` cursors from the previous response, and revalidate with
+the ETag, which changes whenever content changes.
+"""
+
+import hashlib
+from functools import wraps
+from django.core.exceptions import BadRequest
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_safe
+from codestar.page_cache import content_version
+from .models import Comment, Post
+from .pagination import keyset_page
+from .views import COMMENTS_PER_PAGE
+
+# The number of posts in a page of the post list.
+POSTS_PER_PAGE = 20
+
+# Each field's database column and how its value is read from an instance.
+POST_FIELDS = {
+    "slug": ("slug", lambda post: post.slug),
+    "title": ("title", lambda post: post.title),
+    "author": ("author__username", lambda post: post.author.username),
+    "excerpt": ("excerpt", lambda post: post.excerpt),
+    "content": ("rendered_content", lambda post: post.rendered_content),
+    "image": (
+        "image_derivatives",
+        lambda post: post.image_derivatives.get("masthead", {}).get("src"),
+    ),
+    "comment_count": (
+        "approved_comment_count",
+        lambda post: post.approved_comment_count,
+    ),
+    "created_on": ("created_on", lambda post: post.created_on),
+    "updated_on": ("updated_on", lambda post: post.updated_on),
+}
+# The fields of posts in the post list when no fields are requested.
+POST_LIST_FIELDS = (
+    "slug",
+    "title",
+    "author",
+    "excerpt",
+    "image",
+    "comment_count",
+    "created_on",
+)
+COMMENT_FIELDS = {
+    "author": ("author__username", lambda comment: comment.author.username),
+    "body": ("body", lambda comment: comment.body),
+    "created_on": ("created_on", lambda comment: comment.created_on),
+}
+
+
+def _requested_fields(request, available, default):
+    """
+    Return the fields named by the request's `fields` query parameter.
+
+    Args:
+        request (HttpRequest): The API request.
+        available (dict): The fields that may be requested.
+        default (iterable): The fields returned if none are requested.
+
+    Raises:
+        BadRequest: If an unknown field is requested.
+
+    Returns:
+        list: The field names.
+    """
+    requested = request.GET.get("fields")
+    if not requested:
+        return list(default)
+    fields = [field.strip() for field in requested.split(",")]
+    unknown = [field for field in fields if field not in available]
+    if unknown:
+        raise BadRequest(f"Unknown fields: {', '.join(unknown)}.")
+    return fields
+
+
+def _select(queryset, available, fields):
+    """
+    Fetch only the columns behind `fields`, plus those needed for paging.
+    """
+    columns = [available[field][0] for field in fields]
+    if "author" in fields:
+        queryset = queryset.select_related("author")
+    return queryset.only("created_on", *columns)
+
+
+def _serialize(instance, available, fields):
+    return {field: available[field][1](instance) for field in fields}
+
+
+def _page_response(page, available, fields):
+    """Return a JSON response holding a keyset page of instances."""
+    return JsonResponse(
+        {
+            "results": [
+                _serialize(instance, available, fields) for instance in page
+            ],
+            "next_cursor": page.next_cursor,
+            "previous_cursor": page.previous_cursor,
+        }
+    )
+
+
+def _etag(request, *args, **kwargs):
+    """
+    Return the ETag of an API response.
+
+    It's derived from the page cache's content version, which changes
+    whenever a post or comment changes, so it costs no database query.
+    """
+    raw = f"{content_version()}|{request.get_full_path()}"
+    return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def api_view(view):
+    """
+    Make `view` a read-only API view answered with 304 when the client's
+    copy is current.
+    """
+
+    @wraps(view)
+    @require_safe
+    @condition(etag_func=_etag)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        # Clients may store responses, but must revalidate before reuse.
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+    return wrapper
+
+
+@api_view
+def post_list(request):
+    """
+    Return a page of published posts, newest first.
+
+    Args:
+        request (HttpRequest):
+            A GET request. It may have a `fields` query parameter and a
+            `before` or `after` cursor from a previous page.
+
+    Models:
+        :model:`blog.Post`
+
+    Returns:
+        JsonResponse:
+            Contains `results`, the posts, and `next_cursor` and
+            `previous_cursor`, which are null if there is no such page.
+    """
+    fields = _requested_fields(request, POST_FIELDS, POST_LIST_FIELDS)
+    posts = _select(Post.objects.published(), POST_FIELDS, fields)
+    page = keyset_page(
+        posts,
+        POSTS_PER_PAGE,
+        before=request.GET.get("before"),
+        after=request.GET.get("after"),
+    )
+    return _page_response(page, POST_FIELDS, fields)
+
+
+@api_view
+def post_detail(request, slug):
+    """
+    Return one published post.
+
+    Args:
+        request (HttpRequest):
+            A GET request. It may have a `fields` query parameter.
+        slug (str): Contains the ID of a :model:`blog.Post`.
+
+    Models:
+        :model:`blog.Post`
+
+    Returns:
+        JsonResponse: The post's fields. All fields if none are requested.
+    """
+    fields = _requested_fields(request, POST_FIELDS, POST_FIELDS)
+    posts = _select(Post.objects.published(), POST_FIELDS, fields)
+    post = get_object_or_404(posts, slug=slug)
+    return JsonResponse(_serialize(post, POST_FIELDS, fields))
+
+
+@api_view
+def comment_list(request, slug):
+    """
+    Return a page of a published post's approved comments, newest first.
+
+    Args:
+        request (HttpRequest):
+            A GET request. It may have a `fields` query parameter and a
+            `before` or `after` cursor from a previous page.
+        slug (str): Contains the ID of a :model:`blog.Post`.
+
+    Models:
+        :model:`blog.Post`
+        :model:`blog.Comment`
+
+    Returns:
+        JsonResponse:
+            Contains `results`, the comments, and `next_cursor` and
+            `previous_cursor`, which are null if there is no such page.
+    """
+    fields = _requested_fields(request, COMMENT_FIELDS, COMMENT_FIELDS)
+    post = get_object_or_404(Post.objects.published().only("pk"), slug=slug)
+    comments = _select(
+        Comment.objects.filter(post=post, approved=True),
+        COMMENT_FIELDS,
+        fields,
+    )
+    page = keyset_page(
+        comments,
+        COMMENTS_PER_PAGE,
+        before=request.GET.get("before"),
+        after=request.GET.get("after"),
+    )
+    return _page_response(page, COMMENT_FIELDS, fields)
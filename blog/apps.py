@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from codestar.page_cache import watch_models
+        from .models import Comment, Post
+        from .search import index_post, unindex_post
+
+        watch_models(Comment, Post)
+        post_save.connect(index_post, sender=Post)
+        post_delete.connect(unindex_post, sender=Post)
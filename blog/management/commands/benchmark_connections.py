@@ -0,0 +1,123 @@
+import io
+import sys
+import time
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+from django.urls import reverse
+from blog.models import Post
+
+# (label, CONN_MAX_AGE) for each mode compared.
+MODES = (
+    ("New connection per request", 0),
+    ("Persistent connection", 600),
+)
+
+
+class Command(BaseCommand):
+    """
+    Compare `post_detail` requests per second with and without persistent
+    database connections.
+
+    Requests go through the full WSGI handler, so connections are closed
+    or kept at the end of each request exactly as under gunicorn. The page
+    cache is turned off so that every request reaches the database. Point
+    `DATABASE_URL` at a local PostgreSQL server to include connection setup
+    and TLS costs; SQLite shows the cost of Django's connection setup alone.
+
+    Models:
+        :model:`blog.Post`
+    """
+
+    help = "Benchmark post_detail with and without persistent connections."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="The number of requests timed in each mode.",
+        )
+        parser.add_argument(
+            "--slug",
+            help="The post to request. Defaults to the newest post.",
+        )
+        parser.add_argument(
+            "--host",
+            default="127.0.0.1",
+            help="The host name to send requests to.",
+        )
+
+    def handle(self, *args, **options):
+        slug = options["slug"] or (
+            Post.objects.published()
+            .order_by("-created_on")
+            .values_list("slug", flat=True)
+            .first()
+        )
+        if slug is None:
+            raise CommandError("There are no published posts to request.")
+        try:
+            staticfiles_storage.url("css/bundle.css")
+        except ValueError:
+            raise CommandError("Run build_static before benchmarking.")
+        path = reverse("post_detail", args=[slug])
+        handler = WSGIHandler()
+        opened = []
+
+        def count_connection(sender, connection, **kwargs):
+            opened.append(connection)
+
+        connection_created.connect(count_connection, weak=False)
+        original_max_age = connection.settings_dict["CONN_MAX_AGE"]
+        try:
+            with override_settings(PAGE_CACHE_TIMEOUT=0):
+                for label, max_age in MODES:
+                    connection.close()
+                    connection.settings_dict["CONN_MAX_AGE"] = max_age
+                    self._request(handler, path, options["host"])
+                    opened.clear()
+                    started = time.perf_counter()
+                    for _ in range(options["requests"]):
+                        self._request(handler, path, options["host"])
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(
+                        f"{label}: {options['requests'] / elapsed:.1f} "
+                        f"requests/s, {len(opened)} connections opened"
+                    )
+        finally:
+            connection_created.disconnect(count_connection)
+            connection.settings_dict["CONN_MAX_AGE"] = original_max_age
+
+    def _request(self, handler, path, host):
+        """
+        Send one GET request through `handler` and check it succeeded.
+
+        Raises:
+            CommandError: If the response isn't 200 OK.
+        """
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": path,
+            "QUERY_STRING": "",
+            "SCRIPT_NAME": "",
+            "SERVER_NAME": host,
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(),
+            "wsgi.errors": sys.stderr,
+        }
+        statuses = []
+
+        def start_response(status, headers):
+            statuses.append(status)
+
+        response = handler(environ, start_response)
+        # Closing the response ends the request, as a WSGI server would.
+        response.close()
+        if not statuses[0].startswith("200"):
+            raise CommandError(f"{path} returned {statuses[0]}.")
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import time
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from codestar.loadtest import get, gunicorn
+from blog.models import Post
+
+# (label, gunicorn arguments) for each server profile compared.
+PROFILES = (
+    ("Bare gunicorn", ("codestar.wsgi",)),
+    ("gunicorn_config", ("--config=python:codestar.gunicorn_config",)),
+)
+# (label, key) for each memory figure reported by `_memory`.
+MEMORY_FIELDS = (("RSS", "rss"), ("PSS", "pss"), ("Private", "private"))
+# Seconds to wait for every worker to start.
+WORKER_TIMEOUT = 30
+
+
+def _children(pid):
+    """Return the IDs of the processes whose parent is `pid`."""
+    children = []
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as file:
+                stat = file.read()
+        except OSError:
+            continue
+        # The command name is in brackets and may contain spaces.
+        if int(stat.rsplit(")", 1)[1].split()[1]) == pid:
+            children.append(int(name))
+    return children
+
+
+def _memory(pid):
+    """
+    Return a process's memory use in bytes.
+
+    Returns:
+        dict: The resident set size ("rss"), the proportional set size,
+        which splits shared pages between the processes sharing them
+        ("pss"), and the pages used by this process alone ("private").
+    """
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as file:
+        for line in file:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "private": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+async def _load(port, paths, requests, concurrency):
+    """
+    Send `requests` requests from `concurrency` clients at once, each
+    sending its next request when the last one is answered.
+
+    Returns:
+        tuple: The seconds taken and the number of failed requests.
+    """
+    remaining = iter(range(requests))
+    failed = 0
+
+    async def client():
+        nonlocal failed
+        for index in remaining:
+            status, _ = await get(port, paths[index % len(paths)])
+            failed += status != 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - started, failed
+
+
+class Command(BaseCommand):
+    """
+    Compare throughput and memory per worker for a bare gunicorn command
+    and for `codestar/gunicorn_config.py`.
+
+    Both servers run the same number of workers, and requests alternate
+    between the home page and a post. Memory is read once every request has
+    been answered. RSS counts shared pages in full for every worker, so the
+    memory saved by preloading shows in PSS and private memory. Needs Linux.
+
+    Models:
+        :model:`blog.Post`
+    """
+
+    help = "Benchmark gunicorn throughput and memory per worker."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="The number of workers each server runs.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=1000,
+            help="The number of requests timed for each server.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=16,
+            help="The number of clients sending requests at once.",
+        )
+        parser.add_argument(
+            "--slug",
+            help="The post to request. Defaults to the newest post.",
+        )
+
+    def handle(self, *args, **options):
+        if not os.path.exists("/proc/self/smaps_rollup"):
+            raise CommandError("Measuring memory needs Linux 4.14 or later.")
+        slug = options["slug"] or (
+            Post.objects.published()
+            .order_by("-created_on")
+            .values_list("slug", flat=True)
+            .first()
+        )
+        if slug is None:
+            raise CommandError("There are no published posts to request.")
+        try:
+            staticfiles_storage.url("css/bundle.css")
+        except ValueError:
+            raise CommandError("Run build_static before benchmarking.")
+        paths = (reverse("home"), reverse("post_detail", args=[slug]))
+        workers = options["workers"]
+        env = {"WEB_CONCURRENCY": str(workers)}
+        requests, concurrency = options["requests"], options["concurrency"]
+        for label, arguments in PROFILES:
+            with gunicorn(*arguments, env=env) as (server, port):
+                worker_ids = self._wait_for_workers(server.pid, workers)
+                # Load each worker's views before timing.
+                asyncio.run(_load(port, paths, workers * 4, workers))
+                elapsed, failed = asyncio.run(
+                    _load(port, paths, requests, concurrency)
+                )
+                memory = [_memory(pid) for pid in worker_ids]
+            self.stdout.write(
+                f"{label}: {requests / elapsed:.1f} requests/s, "
+                f"{failed} failed"
+            )
+            for name, field in MEMORY_FIELDS:
+                mean = sum(usage[field] for usage in memory) / len(memory)
+                self.stdout.write(
+                    f"  {name} per worker: {mean / 2 ** 20:.1f} MiB"
+                )
+
+    def _wait_for_workers(self, pid, workers):
+        """
+        Return the IDs of the gunicorn arbiter's workers once all are running.
+
+        Raises:
+            CommandError: If they don't all start within WORKER_TIMEOUT.
+        """
+        deadline = time.monotonic() + WORKER_TIMEOUT
+        while time.monotonic() < deadline:
+            children = _children(pid)
+            if len(children) >= workers:
+                return children
+            time.sleep(0.1)
+        raise CommandError(f"{workers} workers didn't start.")
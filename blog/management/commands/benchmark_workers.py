@@ -0,0 +1,133 @@
+import asyncio
+import time
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from codestar.loadtest import get, gunicorn, percentile
+from blog.models import Post
+
+# (label, application, gunicorn worker class) for each server compared.
+PROFILES = (
+    ("WSGI, sync worker", "codestar.wsgi", "sync"),
+    (
+        "ASGI, uvicorn worker",
+        "codestar.asgi:application",
+        "uvicorn_worker.UvicornWorker",
+    ),
+)
+
+
+async def _load(port, path, fast, slow, delay, duration):
+    """
+    Send `fast` quick requests and `slow` slow ones, each spread evenly over
+    `duration` seconds.
+
+    Returns:
+        tuple: The seconds until every response arrived, and the results of
+        :func:`codestar.loadtest.get` for the fast and for the slow requests.
+    """
+    started = time.perf_counter()
+    fast_results, slow_results = await asyncio.gather(
+        asyncio.gather(
+            *(
+                get(port, path, index * duration / fast)
+                for index in range(fast)
+            )
+        ),
+        asyncio.gather(
+            *(
+                get(port, path, index * duration / slow, delay)
+                for index in range(slow)
+            )
+        ),
+    )
+    return time.perf_counter() - started, fast_results, slow_results
+
+
+class Command(BaseCommand):
+    """
+    Compare how one sync WSGI worker and one uvicorn ASGI worker cope with
+    slow clients.
+
+    Each server runs under gunicorn with a single worker. Quick clients and
+    slow clients, which take `--client-delay` seconds to send their request,
+    arrive steadily for `--duration` seconds. A sync worker is tied up by
+    each slow client until its request arrives, so the quick clients queue
+    behind it; a uvicorn worker waits for every connection at once and runs
+    the async read views as requests arrive. The page cache is turned off so
+    that every request reaches the database.
+
+    Models:
+        :model:`blog.Post`
+    """
+
+    help = "Benchmark slow clients against one WSGI and one ASGI worker."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fast-clients",
+            type=int,
+            default=100,
+            help="The number of clients that send their request at once.",
+        )
+        parser.add_argument(
+            "--slow-clients",
+            type=int,
+            default=10,
+            help="The number of clients that send their request slowly.",
+        )
+        parser.add_argument(
+            "--client-delay",
+            type=float,
+            default=1.0,
+            help="The seconds each slow client takes to send its request.",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=5.0,
+            help="The seconds over which the clients arrive.",
+        )
+        parser.add_argument(
+            "--slug",
+            help="The post to request. Defaults to the newest post.",
+        )
+
+    def handle(self, *args, **options):
+        slug = options["slug"] or (
+            Post.objects.published()
+            .order_by("-created_on")
+            .values_list("slug", flat=True)
+            .first()
+        )
+        if slug is None:
+            raise CommandError("There are no published posts to request.")
+        try:
+            staticfiles_storage.url("css/bundle.css")
+        except ValueError:
+            raise CommandError("Run build_static before benchmarking.")
+        path = reverse("post_detail", args=[slug])
+        load = (
+            options["fast_clients"],
+            options["slow_clients"],
+            options["client_delay"],
+            options["duration"],
+        )
+        for label, application, worker_class in PROFILES:
+            with gunicorn(
+                application, "--workers=1", f"--worker-class={worker_class}"
+            ) as (_, port):
+                asyncio.run(get(port, path))
+                elapsed, fast, slow = asyncio.run(_load(port, path, *load))
+            results = fast + slow
+            failed = sum(1 for status, _ in results if status != 200)
+            latencies = [latency for _, latency in fast]
+            # The average number of connections open at any moment.
+            concurrency = sum(latency for _, latency in results) / elapsed
+            self.stdout.write(
+                f"{label}: {len(results) / elapsed:.1f} requests/s, "
+                f"{concurrency:.1f} connections open on average, "
+                f"quick clients waited {percentile(latencies, 50):.3f}s "
+                f"(median) and {percentile(latencies, 95):.3f}s (95th "
+                f"percentile), {failed} failed"
+            )
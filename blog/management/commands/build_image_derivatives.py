@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from about.cache import invalidate_about
+from about.models import About
+from blog.models import Post
+from codestar.images import (
+    build_default_derivatives,
+    build_derivatives,
+    is_placeholder,
+    public_id_of,
+)
+from codestar.page_cache import bump_content_version
+
+
+class Command(BaseCommand):
+    """
+    Build the responsive derivatives of uploaded and default images.
+
+    Use it to backfill images uploaded before derivatives existed, or after
+    changing the variants in `codestar.images`.
+
+    Models:
+        :model:`blog.Post`
+        :model:`about.About`
+    """
+
+    help = "Rebuild the responsive image derivatives of posts and About."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--defaults",
+            action="store_true",
+            help="Also rebuild the static default images' derivatives.",
+        )
+
+    def handle(self, *args, **options):
+        if options["defaults"]:
+            build_default_derivatives(settings.STATICFILES_DIRS[0])
+            self.stdout.write("Built the default image derivatives.")
+        sources = (
+            (Post, "featured_image", ("card", "masthead")),
+            (About, "profile_image", ("profile",)),
+        )
+        built = failed = 0
+        for model, field_name, variants in sources:
+            instances = model.objects.only(field_name, "image_derivatives")
+            for instance in instances.iterator():
+                image = getattr(instance, field_name)
+                derivatives = build_derivatives(image, variants)
+                if not derivatives and not is_placeholder(public_id_of(image)):
+                    # The backend failed and has logged why; keep whatever
+                    # derivatives are already stored.
+                    failed += 1
+                    continue
+                if derivatives != instance.image_derivatives:
+                    model.objects.filter(pk=instance.pk).update(
+                        image_derivatives=derivatives
+                    )
+                    built += 1
+        # The updates above skip the signals that normally do this.
+        invalidate_about()
+        bump_content_version()
+        message = f"Rebuilt derivatives for {built} images."
+        if failed:
+            message += f" Couldn't build derivatives for {failed} images."
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
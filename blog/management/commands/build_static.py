@@ -0,0 +1,71 @@
+import os
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from codestar.storage import project_static_files
+
+
+def _size(path):
+    """Return a file's size in bytes, or None if it doesn't exist."""
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return None
+
+
+def _savings(original, size):
+    """Format a file size with the percentage saved on `original` bytes."""
+    if size is None:
+        return "-"
+    saved = 100 - 100 * size / original if original else 0
+    return f"{size} ({saved:.0f}%)"
+
+
+class Command(BaseCommand):
+    """
+    Collect static files and report the bytes saved on each project asset.
+
+    Runs `collectstatic`, which minifies, fingerprints and compresses the
+    files through `codestar.storage.MinifiedCompressedManifestStorage`, then
+    compares each source file with the minified, gzip and brotli files that
+    are served in its place.
+    """
+
+    help = "Build static files and report per-asset byte savings."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--report-only",
+            action="store_true",
+            help="Report on the last build without collecting again.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["report_only"]:
+            call_command("collectstatic", interactive=False, verbosity=0)
+        columns = ("Asset", "Source", "Minified", "Gzip", "Brotli")
+        rows = [columns]
+        totals = [0, 0, 0, 0]
+        for name in sorted(project_static_files()):
+            source = _size(finders.find(name))
+            served = staticfiles_storage.path(
+                staticfiles_storage.stored_name(name)
+            )
+            sizes = [_size(served), _size(f"{served}.gz")]
+            sizes.append(_size(f"{served}.br"))
+            # The smallest file a browser can be sent.
+            best = min(size for size in sizes if size is not None)
+            for index, size in enumerate((source, *sizes)):
+                totals[index] += best if size is None else size
+            rows.append(
+                (name, str(source), *(_savings(source, s) for s in sizes))
+            )
+        rows.append(
+            ("Total", str(totals[0]))
+            + tuple(_savings(totals[0], total) for total in totals[1:])
+        )
+        widths = [max(len(row[i]) for row in rows) for i in range(5)]
+        for row in rows:
+            cells = (cell.ljust(width) for cell, width in zip(row, widths))
+            self.stdout.write("  ".join(cells).rstrip())
@@ -0,0 +1,200 @@
+import glob
+import os
+import re
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+VENDOR_DIR = os.path.join(settings.BASE_DIR, "assets", "vendor")
+STATIC_DIR = os.path.join(settings.BASE_DIR, "static")
+BUNDLE_PATH = os.path.join(STATIC_DIR, "css", "bundle.css")
+
+# The fonts and weights the stylesheets use, and their subset's file names.
+FONTS = {
+    "lato-300.woff2": ("Lato", 300, "lato/Lato-Light.ttf"),
+    "lato-700.woff2": ("Lato", 700, "lato/Lato-Bold.ttf"),
+}
+# Basic Latin, Latin-1 and typographic punctuation.
+TEXT_UNICODES = "U+0020-007E,U+00A0-00FF,U+2013-2014,U+2018-201D,U+2026"
+
+# Font Awesome's style prefixes, with their font family, weight and file.
+ICON_STYLES = {
+    "fab": ("Font Awesome 5 Brands", 400, "fa-brands-400.woff2"),
+    "far": ("Font Awesome 5 Free", 400, "fa-regular-400.woff2"),
+    "fas": ("Font Awesome 5 Free", 900, "fa-solid-900.woff2"),
+}
+ICON_CLASSES = re.compile(r"\b(fa[brs])\s+fa-([a-z0-9-]+)")
+SOURCE_MAP = re.compile(r"\s*/[*/]# sourceMappingURL=\S+(?: \*/)?\s*$")
+
+
+def _read(*path):
+    with open(os.path.join(*path), encoding="utf-8") as file:
+        return file.read()
+
+
+def template_icons():
+    """
+    Return the Font Awesome icons used by the project's templates.
+
+    Returns:
+        dict: Maps each style prefix, such as "far", to a sorted list of the
+        icon names used with it.
+    """
+    icons = {}
+    patterns = ("templates/**/*.html", "*/templates/**/*.html")
+    for pattern in patterns:
+        for path in glob.glob(
+            os.path.join(settings.BASE_DIR, pattern), recursive=True
+        ):
+            for style, name in ICON_CLASSES.findall(_read(path)):
+                icons.setdefault(style, set()).add(name)
+    return {style: sorted(names) for style, names in sorted(icons.items())}
+
+
+def _codepoint(icon_css, name):
+    """
+    Return the character of a Font Awesome icon.
+
+    Raises:
+        CommandError: If Font Awesome has no icon called `name`.
+    """
+    match = re.search(
+        rf'\.fa-{re.escape(name)}:before{{content:"\\([0-9a-f]+)"}}', icon_css
+    )
+    if match is None:
+        raise CommandError(f"Font Awesome has no icon called {name}.")
+    return int(match[1], 16)
+
+
+def _font_face(family, weight, file_name, display):
+    return (
+        f'@font-face{{font-family:"{family}";font-style:normal;'
+        f"font-weight:{weight};font-display:{display};"
+        f'src:url(../fonts/{file_name}) format("woff2")}}'
+    )
+
+
+def bundle_css(icons):
+    """
+    Return the site's single stylesheet.
+
+    It holds the subset fonts' `@font-face` rules, Bootstrap, the rules for
+    the icons in `icons` and `static/css/style.css`, in that order.
+
+    Args:
+        icons (dict): As returned by :func:`template_icons`.
+
+    Returns:
+        str: The stylesheet.
+    """
+    icon_css = _read(VENDOR_DIR, "fontawesome", "all.min.css")
+    parts = [
+        "/* Built by manage.py bundle_assets from assets/vendor and "
+        "static/css/style.css. Edit those and rebuild. */"
+    ]
+    parts += [
+        _font_face(family, weight, file_name, "swap")
+        for file_name, (family, weight, _) in FONTS.items()
+    ]
+    bootstrap = _read(VENDOR_DIR, "bootstrap", "bootstrap.min.css")
+    parts.append(SOURCE_MAP.sub("", bootstrap))
+    if icons:
+        for style in icons:
+            family, weight, file_name = ICON_STYLES[style]
+            parts.append(_font_face(family, weight, file_name, "block"))
+        parts.append(
+            ",".join(f".{style}" for style in icons)
+            + "{-moz-osx-font-smoothing:grayscale;"
+            "-webkit-font-smoothing:antialiased;display:inline-block;"
+            "font-style:normal;font-variant:normal;text-rendering:auto;"
+            "line-height:1}"
+        )
+        for style in icons:
+            family, weight, _ = ICON_STYLES[style]
+            parts.append(
+                f'.{style}{{font-family:"{family}";font-weight:{weight}}}'
+            )
+        names = sorted({name for group in icons.values() for name in group})
+        for name in names:
+            codepoint = _codepoint(icon_css, name)
+            parts.append(f'.fa-{name}:before{{content:"\\{codepoint:x}"}}')
+    parts.append(_read(STATIC_DIR, "css", "style.css"))
+    return "\n".join(parts) + "\n"
+
+
+def _subset(source, target, unicodes):
+    """
+    Write a WOFF2 copy of a font holding only the characters in `unicodes`.
+
+    Args:
+        source (str): The font's path.
+        target (str): The subset's path.
+        unicodes (list): The code points to keep.
+    """
+    from fontTools import subset
+
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = ["kern", "liga"]
+    # FontForge's timestamps, which browsers don't use.
+    options.drop_tables += ["FFTM"]
+    font = subset.load_font(source, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=unicodes)
+    subsetter.subset(font)
+    subset.save_font(font, target, options)
+
+
+class Command(BaseCommand):
+    """
+    Build the self-hosted CSS bundle, fonts and scripts from `assets/vendor`.
+
+    Writes `static/css/bundle.css`, the only stylesheet `base.html` loads,
+    fonts subset to Latin text and to the icons the templates use, and
+    Bootstrap's script. Run it after editing `static/css/style.css`, adding
+    an icon to a template or upgrading a vendored package, and commit the
+    output. Needs fontTools and Brotli to write the fonts.
+    """
+
+    help = "Bundle the vendored CSS, fonts and scripts into static/."
+
+    def handle(self, *args, **options):
+        try:
+            from fontTools import subset
+        except ImportError:
+            raise CommandError("Install fonttools to subset the fonts.")
+
+        icons = template_icons()
+        fonts_dir = os.path.join(STATIC_DIR, "fonts")
+        os.makedirs(fonts_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(fonts_dir, "*.woff2")):
+            os.remove(path)
+        text_unicodes = subset.parse_unicodes(TEXT_UNICODES)
+        for file_name, (_, _, source) in FONTS.items():
+            target = os.path.join(fonts_dir, file_name)
+            _subset(os.path.join(VENDOR_DIR, source), target, text_unicodes)
+        icon_css = _read(VENDOR_DIR, "fontawesome", "all.min.css")
+        for style, names in icons.items():
+            file_name = ICON_STYLES[style][2]
+            _subset(
+                os.path.join(VENDOR_DIR, "fontawesome", file_name),
+                os.path.join(fonts_dir, file_name),
+                [_codepoint(icon_css, name) for name in names],
+            )
+
+        with open(BUNDLE_PATH, "w", encoding="utf-8") as file:
+            file.write(bundle_css(icons))
+        script_dir = os.path.join(STATIC_DIR, "js", "vendor")
+        os.makedirs(script_dir, exist_ok=True)
+        script = _read(VENDOR_DIR, "bootstrap", "bootstrap.min.js")
+        with open(
+            os.path.join(script_dir, "bootstrap.min.js"), "w", encoding="utf-8"
+        ) as file:
+            file.write(SOURCE_MAP.sub("\n", script))
+
+        for path in sorted(glob.glob(os.path.join(fonts_dir, "*.woff2"))):
+            size = os.path.getsize(path)
+            self.stdout.write(f"{os.path.relpath(path, STATIC_DIR)}: {size}")
+        count = sum(len(names) for names in icons.values())
+        message = f"Bundled {os.path.getsize(BUNDLE_PATH)} bytes of CSS "
+        message += f"and {count} icons."
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,214 @@
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import connections
+from django.test import RequestFactory
+from django.urls import reverse
+from blog.models import Post
+from blog.views import PostList, post_detail
+
+MANIFEST_NAME = "export-manifest.json"
+PAGE_LINK = re.compile(r'href="\?page=(\d+)"')
+
+
+def _init_worker():
+    """Set up Django in a worker process started with "spawn"."""
+    import django
+
+    django.setup()
+
+
+def _index_path(page_number):
+    return "/" if page_number == 1 else f"/page/{page_number}/"
+
+
+def _render(kind, key, host):
+    """
+    Render one page as an anonymous visitor would see it.
+
+    Args:
+        kind (str): "index" for a home page or "post" for a post page.
+        key: The home page number or the post's slug.
+        host (str): The host name the pages are rendered for.
+
+    Returns:
+        tuple: The page's URL path and its HTML as bytes.
+    """
+    factory = RequestFactory(SERVER_NAME=host)
+    if kind == "index":
+        request = factory.get(reverse("home"), {"page": key})
+        request.user = AnonymousUser()
+        response = PostList.as_view(pagination="offset")(request)
+        response.render()
+        # Numbered page links become links to the exported page directories.
+        html = PAGE_LINK.sub(
+            lambda match: f'href="{_index_path(int(match[1]))}"',
+            response.content.decode(),
+        )
+        return _index_path(key), html.encode()
+    path = reverse("post_detail", args=[key])
+    request = factory.get(path)
+    request.user = AnonymousUser()
+    return path, post_detail(request, slug=key).content
+
+
+def _export(output_dir, host, jobs):
+    """
+    Render and write a batch of pages.
+
+    Args:
+        output_dir (str): The directory the site is exported to.
+        host (str): The host name the pages are rendered for.
+        jobs (list): `(kind, key)` pairs for :func:`_render`.
+
+    Returns:
+        int: The number of bytes written.
+    """
+    written = 0
+    for kind, key in jobs:
+        path, html = _render(kind, key, host)
+        directory = os.path.join(output_dir, path.strip("/"))
+        os.makedirs(directory, exist_ok=True)
+        target = os.path.join(directory, "index.html")
+        with open(f"{target}.tmp", "wb") as file:
+            file.write(html)
+        os.replace(f"{target}.tmp", target)
+        written += len(html)
+    return written
+
+
+def _remove(output_dir, *path):
+    """
+    Delete an exported page, and its directory if nothing else is in it.
+    """
+    directory = os.path.join(output_dir, *path)
+    try:
+        os.remove(os.path.join(directory, "index.html"))
+        os.rmdir(directory)
+    except OSError:
+        pass
+
+
+class Command(BaseCommand):
+    """
+    Export the home pages and every published post as static HTML files.
+
+    Post pages are only re-rendered when the post's `updated_on` or approved
+    comment count has changed since the last export. The output can be served
+    without a database, for example by pointing `WHITENOISE_ROOT` at it with
+    `WHITENOISE_INDEX_FILE = True`. Loading older comments and posting
+    comments still need the dynamic site.
+
+    Models:
+        :model:`blog.Post`
+    """
+
+    help = "Render published posts and home pages to static HTML files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=os.path.join(settings.BASE_DIR, "static_site"),
+            help="The directory to write the site to.",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Re-render every post, even if it hasn't changed.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="The number of worker processes that render pages.",
+        )
+        parser.add_argument(
+            "--host",
+            default="127.0.0.1",
+            help="The host name to render pages for.",
+        )
+
+    def handle(self, *args, **options):
+        output_dir = options["output"]
+        os.makedirs(output_dir, exist_ok=True)
+        manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+        previous = {} if options["full"] else self._load(manifest_path)
+        started = time.perf_counter()
+
+        current = {
+            slug: f"{updated_on.isoformat()}|{comment_count}"
+            for slug, updated_on, comment_count in (
+                Post.objects.published()
+                .order_by()
+                .values_list("slug", "updated_on", "approved_comment_count")
+            )
+        }
+        page_count = Paginator(
+            Post.objects.for_list(), PostList.paginate_by
+        ).num_pages
+        for slug in previous.keys() - current.keys():
+            _remove(output_dir, slug)
+        # Home pages live in numbered directories under page/, beside the
+        # page of any post whose slug is "page".
+        pages_dir = os.path.join(output_dir, "page")
+        if os.path.isdir(pages_dir):
+            for name in os.listdir(pages_dir):
+                if name.isdigit() and int(name) > page_count:
+                    _remove(output_dir, "page", name)
+        changed = [
+            slug
+            for slug, version in current.items()
+            if previous.get(slug) != version
+        ]
+        jobs = [("index", number) for number in range(1, page_count + 1)]
+        jobs += [("post", slug) for slug in changed]
+        written = self._run(output_dir, options["host"], jobs, options)
+
+        with open(manifest_path, "w") as file:
+            json.dump(current, file, indent=2, sort_keys=True)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Exported {len(jobs)} pages ({written} bytes) in "
+                f"{elapsed:.2f}s: {len(jobs) / elapsed:.1f} pages/s, "
+                f"{len(current) - len(changed)} posts unchanged."
+            )
+        )
+
+    def _load(self, manifest_path):
+        """
+        Return the post versions recorded by the last export.
+        """
+        try:
+            with open(manifest_path) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def _run(self, output_dir, host, jobs, options):
+        """
+        Render `jobs`, in parallel if more than one worker is requested.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        workers = max(1, min(options["workers"], len(jobs)))
+        if workers == 1:
+            return _export(output_dir, host, jobs)
+        # Workers open their own database connections.
+        connections.close_all()
+        batches = [jobs[index::workers] for index in range(workers)]
+        with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+            results = pool.map(
+                _export,
+                [output_dir] * workers,
+                [host] * workers,
+                batches,
+            )
+            return sum(results)
@@ -0,0 +1,132 @@
+import re
+import subprocess
+import sys
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Starts Django, optionally loads the root URLconf as the first request does,
+# and prints the seconds taken. The marker separates the interpreter's own
+# imports from Django's.
+STARTUP_MARKER = "startup:"
+STARTUP_SCRIPT = """
+import sys
+import time
+sys.stderr.write("{marker}\\n")
+started = time.perf_counter()
+import django
+django.setup()
+if {urls}:
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+print(time.perf_counter() - started)
+"""
+# A line of `python -X importtime` output: its own and cumulative import
+# times in microseconds, and the module indented by its import depth.
+IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def package_of(module):
+    """
+    Return the package a module is counted under: its top-level package, or
+    its app's package for Django's contrib apps.
+    """
+    parts = module.split(".")
+    if parts[:2] == ["django", "contrib"]:
+        return ".".join(parts[:3])
+    return parts[0]
+
+
+def import_times(output):
+    """
+    Return the cumulative import time of each package.
+
+    Only modules imported directly by the startup code are counted, so each
+    package's time includes everything its import pulled in.
+
+    Args:
+        output (str):
+            The standard error of `python -X importtime`. Only the lines
+            after STARTUP_MARKER are read.
+
+    Returns:
+        dict: Maps each package, as named by :func:`package_of`, to
+        microseconds.
+    """
+    times = {}
+    _, _, output = output.partition(STARTUP_MARKER)
+    for line in output.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match is None:
+            continue
+        _, cumulative, indent, module = match.groups()
+        if len(indent) == 1:
+            package = package_of(module)
+            times[package] = times.get(package, 0) + int(cumulative)
+    return times
+
+
+class Command(BaseCommand):
+    """
+    Report how long Django takes to start and which packages the time goes
+    to.
+
+    Starts Django in a new interpreter with `python -X importtime`, so
+    nothing is imported already, and adds up the import time of each
+    top-level package, including the packages it imports in turn. Django's
+    contrib apps are counted separately, and packages of installed apps are
+    listed with their app labels.
+    """
+
+    help = "Report the time each package adds to Django's startup."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--urls",
+            action="store_true",
+            help="Load the root URLconf too, as the first request does.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="The number of packages to list.",
+        )
+
+    def handle(self, *args, **options):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                STARTUP_SCRIPT.format(
+                    marker=STARTUP_MARKER, urls=options["urls"]
+                ),
+            ],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(f"Django didn't start:\n{result.stderr}")
+        elapsed = float(result.stdout.split()[-1]) * 1000
+        times = import_times(result.stderr)
+
+        app_labels = {}
+        for app_config in apps.get_app_configs():
+            package = package_of(app_config.name)
+            app_labels.setdefault(package, []).append(app_config.label)
+        total = sum(times.values()) / 1000
+        self.stdout.write(
+            f"Started in {elapsed:.0f} ms, {total:.0f} ms of it importing."
+        )
+        self.stdout.write(f"{'Package':<32}{'ms':>8}{'%':>7}  Apps")
+        ranked = sorted(times.items(), key=lambda item: item[1], reverse=True)
+        for package, microseconds in ranked[: options["limit"]]:
+            milliseconds = microseconds / 1000
+            labels = ", ".join(app_labels.get(package, ()))
+            self.stdout.write(
+                f"{package:<32}{milliseconds:>8.1f}"
+                f"{milliseconds / total * 100:>7.1f}  {labels}".rstrip()
+            )
@@ -0,0 +1,43 @@
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    """
+    Delete expired sessions from the database in batches.
+
+    Unlike `clearsessions`, each batch is a short DELETE of at most
+    `--batch-size` rows by primary key, so a large backlog doesn't hold locks
+    on the session table for long. Cached copies of the sessions expire from
+    the cache by themselves.
+
+    Models:
+        :model:`sessions.Session`
+    """
+
+    help = "Delete expired database sessions in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="The most sessions deleted by each query.",
+        )
+
+    def handle(self, *args, **options):
+        expired = Session.objects.filter(expire_date__lt=timezone.now())
+        total = 0
+        batch_size = options["batch_size"]
+        while True:
+            keys = list(expired.values_list("pk", flat=True)[:batch_size])
+            if keys:
+                # Sessions have no relations or delete signals, so this is
+                # a single DELETE.
+                deleted, _ = Session.objects.filter(pk__in=keys).delete()
+                total += deleted
+            if len(keys) < batch_size:
+                break
+        message = f"Deleted {total} expired sessions."
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from blog.models import Post
+from codestar.page_cache import bump_content_version
+
+
+class Command(BaseCommand):
+    """
+    Rebuild or check the approved comment counts stored on blog posts.
+
+    Models:
+        :model:`blog.Post`
+        :model:`blog.Comment`
+    """
+
+    help = "Recount the approved comments for every post in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Report posts with wrong counts and exit with an error "
+            "instead of fixing them.",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            self._check()
+        else:
+            updated = Post.objects.rebuild_comment_counts()
+            bump_content_version()
+            message = f"Rebuilt comment counts for {updated} posts."
+            self.stdout.write(self.style.SUCCESS(message))
+
+    def _check(self):
+        """
+        Report every post whose stored count is wrong.
+
+        Raises:
+            CommandError: If any post has a wrong count.
+        """
+        stale_posts = Post.objects.with_stale_comment_counts().values_list(
+            "slug", "approved_comment_count", "actual_comment_count"
+        )
+        for slug, stored, actual in stale_posts:
+            self.stdout.write(f"{slug}: stored {stored}, actual {actual}")
+        if stale_posts:
+            raise CommandError(f"{len(stale_posts)} posts have wrong counts.")
+        message = "All comment counts are correct."
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from blog.models import Post
+from blog.rendering import render_content
+from blog.search import index_post
+from codestar.page_cache import bump_content_version
+
+
+class Command(BaseCommand):
+    """
+    Render the stored, sanitized HTML for blog posts in batches.
+
+    Run it after changing the rendering rules in `blog.rendering`.
+
+    Models:
+        :model:`blog.Post`
+    """
+
+    help = "Re-render Post.rendered_content from Post.content in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="Only render posts that have no rendered content.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="The number of posts to load and update at a time.",
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by("pk").only(
+            "title", "excerpt", "content"
+        )
+        if options["missing"]:
+            posts = posts.filter(rendered_content="")
+        batch_size = options["batch_size"]
+        batch, rendered = [], 0
+        rendered_on = timezone.now()
+        for post in posts.iterator(chunk_size=batch_size):
+            post.rendered_content = render_content(post.content)
+            # Changes the posts' ETags too.
+            post.updated_on = rendered_on
+            batch.append(post)
+            if len(batch) == batch_size:
+                rendered += self._save(batch)
+                batch = []
+        rendered += self._save(batch)
+        bump_content_version()
+        self.stdout.write(self.style.SUCCESS(f"Rendered {rendered} posts."))
+
+    def _save(self, posts):
+        """
+        Store the rendered content and update time of `posts` in one bulk
+        update, and reindex their text, which `bulk_update` doesn't signal.
+
+        Returns:
+            int: The number of posts saved.
+        """
+        Post.objects.bulk_update(posts, ["rendered_content", "updated_on"])
+        for post in posts:
+            index_post(Post, post, Post.objects.db)
+        return len(posts)
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.25 on 2026-10-18 08:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_post_featured_image'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'approved', 'created_on'], name='blog_comment_thread_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.25 on 2026-10-18 08:03
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_approved_comments(apps, schema_editor):
+    Comment = apps.get_model('blog', 'Comment')
+    Post = apps.get_model('blog', 'Post')
+    approved_counts = (
+        Comment.objects.filter(post=models.OuterRef('pk'), approved=True)
+        .order_by()
+        .values('post')
+        .annotate(count=models.Count('pk'))
+        .values('count')
+    )
+    Post.objects.update(
+        approved_comment_count=Coalesce(models.Subquery(approved_counts), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_comment_thread_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='approved_comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            count_approved_comments, migrations.RunPython.noop
+        ),
+    ]
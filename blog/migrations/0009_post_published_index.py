@@ -0,0 +1,17 @@
+# Generated by Django 4.2.25 on 2026-10-18 08:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_approved_comment_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', 'created_on'], name='blog_post_published_idx'),
+        ),
+    ]
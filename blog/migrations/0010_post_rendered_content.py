@@ -0,0 +1,100 @@
+# Generated by Django 4.2.25 on 2026-10-18 08:09
+
+from urllib.parse import urlsplit
+
+import bleach
+from bleach.css_sanitizer import CSSSanitizer
+from bleach.html5lib_shim import Filter
+from django.db import migrations, models
+
+# A copy of the rendering rules in blog.rendering when this migration was
+# written, so later changes to them don't change what this migration does.
+ALLOWED_TAGS = frozenset(
+    {
+        'a', 'b', 'blockquote', 'br', 'code', 'div', 'em', 'h1', 'h2', 'h3',
+        'h4', 'h5', 'h6', 'hr', 'i', 'iframe', 'img', 'li', 'ol', 'p', 'pre',
+        's', 'span', 'strike', 'strong', 'sub', 'sup', 'table', 'tbody', 'td',
+        'th', 'thead', 'tr', 'u', 'ul',
+    }
+)
+ALLOWED_CSS_PROPERTIES = frozenset(
+    {
+        'background-color', 'color', 'float', 'font-style', 'font-weight',
+        'height', 'line-height', 'margin', 'margin-bottom', 'margin-left',
+        'margin-right', 'margin-top', 'max-width', 'text-align',
+        'text-decoration', 'width',
+    }
+)
+EMBED_HOSTS = frozenset(
+    {'player.vimeo.com', 'www.youtube.com', 'www.youtube-nocookie.com'}
+)
+IFRAME_ATTRIBUTES = frozenset(
+    {'width', 'height', 'frameborder', 'allowfullscreen', 'style'}
+)
+
+
+def allow_iframe_attribute(tag, name, value):
+    if name == 'src':
+        url = urlsplit(value)
+        return url.scheme == 'https' and url.hostname in EMBED_HOSTS
+    return name in IFRAME_ATTRIBUTES
+
+
+ALLOWED_ATTRIBUTES = {
+    '*': ['class', 'style'],
+    'a': ['href', 'title', 'target'],
+    'iframe': allow_iframe_attribute,
+    'img': ['src', 'alt', 'title', 'width', 'height'],
+    'td': ['colspan', 'rowspan'],
+    'th': ['colspan', 'rowspan'],
+}
+
+
+class PostProcessFilter(Filter):
+
+    def __iter__(self):
+        for token in super().__iter__():
+            if token['type'] in ('StartTag', 'EmptyTag'):
+                attributes = token['data']
+                if token['name'] in ('img', 'iframe'):
+                    attributes[(None, 'loading')] = 'lazy'
+                elif token['name'] == 'a' and (None, 'target') in attributes:
+                    attributes[(None, 'rel')] = 'noopener noreferrer'
+            yield token
+
+
+def render_content(content):
+    cleaner = bleach.Cleaner(
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        css_sanitizer=CSSSanitizer(
+            allowed_css_properties=ALLOWED_CSS_PROPERTIES
+        ),
+        strip=True,
+        filters=[PostProcessFilter],
+    )
+    return cleaner.clean(content)
+
+
+def render_posts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    posts = list(Post.objects.only('content'))
+    for post in posts:
+        post.rendered_content = render_content(post.content)
+    Post.objects.bulk_update(posts, ['rendered_content'], batch_size=100)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_published_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='rendered_content',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(render_posts, migrations.RunPython.noop),
+    ]
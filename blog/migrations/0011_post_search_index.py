@@ -0,0 +1,53 @@
+# Generated by Django 4.2.25 on 2026-10-18 08:12
+
+from django.db import migrations
+
+# The search index as it was first created. Later migrations change it, so
+# the SQL is kept here rather than read from blog.search.
+FTS_TABLE = 'blog_post_fts'
+POSTGRES_SCHEMA = [
+    """
+    ALTER TABLE blog_post ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(excerpt, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(content, '')), 'C')
+    ) STORED
+    """,
+    'CREATE INDEX blog_post_search_idx ON blog_post USING gin (search_vector)',
+]
+SQLITE_SCHEMA = [
+    f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, excerpt, content)',
+    f"""
+    INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content)
+    SELECT id, title, excerpt, content FROM blog_post
+    """,
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': POSTGRES_SCHEMA, 'sqlite': SQLITE_SCHEMA}
+    for statement in statements.get(vendor, []):
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            'ALTER TABLE blog_post DROP COLUMN search_vector'
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_post_rendered_content'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,81 @@
+from html import unescape
+
+from django.db import migrations
+from django.utils.html import strip_tags
+
+# Index the text of the rendered content instead of the raw editor HTML, so
+# that tag and attribute names aren't searched.
+FTS_TABLE = 'blog_post_fts'
+POSTGRES_SEARCH_VECTOR = """
+    ALTER TABLE blog_post ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(excerpt, '')), 'B')
+        || setweight(to_tsvector('english', {content}), 'C')
+    ) STORED
+"""
+POSTGRES_TEXT = (
+    "regexp_replace(coalesce(rendered_content, ''), '<[^>]*>', ' ', 'g')"
+)
+POSTGRES_HTML = "coalesce(content, '')"
+POSTGRES_SEARCH_INDEX = (
+    'CREATE INDEX blog_post_search_idx ON blog_post USING gin (search_vector)'
+)
+
+
+def rebuild_postgres_index(schema_editor, content):
+    schema_editor.execute('ALTER TABLE blog_post DROP COLUMN search_vector')
+    schema_editor.execute(POSTGRES_SEARCH_VECTOR.format(content=content))
+    schema_editor.execute(POSTGRES_SEARCH_INDEX)
+
+
+def rebuild_sqlite_index(schema_editor, rows):
+    schema_editor.execute(f'DROP TABLE {FTS_TABLE}')
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, excerpt, content)'
+    )
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content) '
+            'VALUES (%s, %s, %s, %s)',
+            list(rows),
+        )
+
+
+def index_text(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        rebuild_postgres_index(schema_editor, POSTGRES_TEXT)
+    elif vendor == 'sqlite':
+        Post = apps.get_model('blog', 'Post')
+        posts = Post.objects.values_list(
+            'id', 'title', 'excerpt', 'rendered_content'
+        )
+        rebuild_sqlite_index(
+            schema_editor,
+            (
+                (pk, title, excerpt, unescape(strip_tags(rendered)))
+                for pk, title, excerpt, rendered in posts.iterator()
+            ),
+        )
+
+
+def index_html(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        rebuild_postgres_index(schema_editor, POSTGRES_HTML)
+    elif vendor == 'sqlite':
+        Post = apps.get_model('blog', 'Post')
+        posts = Post.objects.values_list('id', 'title', 'excerpt', 'content')
+        rebuild_sqlite_index(schema_editor, posts.iterator())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_comment_moderation_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(index_text, index_html),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.25 on 2026-10-18 09:17
+
+import blog.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_post_search_text'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='slug',
+            field=models.SlugField(max_length=200, unique=True, validators=[blog.models.validate_post_slug]),
+        ),
+    ]
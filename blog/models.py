@@ -1,11 +1,170 @@
 from cloudinary.models import CloudinaryField
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import User
+from codestar.images import refresh_derivatives
 
 
 # Create your models here.
 DRAFT, PUBLISHED = 0, 1
 STATUS = ((DRAFT, "Draft"), (PUBLISHED, "Published"))
+# Slugs whose URLs belong to other blog pages.
+RESERVED_SLUGS = frozenset({"search"})
+
+
+def validate_post_slug(slug):
+    """Reject slugs whose post details URL is used by another page."""
+    if slug in RESERVED_SLUGS:
+        raise ValidationError(
+            "%(slug)s is used by another page.",
+            code="reserved",
+            params={"slug": slug},
+        )
+
+
+class PostQuerySet(models.QuerySet):
+    """
+    Query-shaping methods for :model:`blog.Post`.
+    """
+
+    # The columns used by the post cards on the home page.
+    LIST_FIELDS = (
+        "title",
+        "slug",
+        "author__username",
+        "featured_image",
+        "has_image",
+        "image_derivatives",
+        "excerpt",
+        "created_on",
+        "approved_comment_count",
+    )
+
+    def published(self):
+        """Return only published posts."""
+        return self.filter(status=PUBLISHED)
+
+    def with_author(self):
+        """Fetch each post's author in the same query as the post."""
+        return self.select_related("author")
+
+    def for_list(self):
+        """
+        Return published posts with only the columns the post list renders.
+        """
+        return self.published().with_author().only(*self.LIST_FIELDS)
+
+    def with_stale_comment_counts(self):
+        """
+        Return posts whose `approved_comment_count` doesn't match the number
+        of approved comments in the database.
+
+        Each post is annotated with `actual_comment_count`.
+        """
+        return self.annotate(
+            actual_comment_count=models.Count(
+                "comments", filter=models.Q(comments__approved=True)
+            )
+        ).exclude(approved_comment_count=models.F("actual_comment_count"))
+
+    def rebuild_comment_counts(self):
+        """
+        Recount the approved comments for every post in one UPDATE.
+
+        Returns:
+            int: The number of posts updated.
+        """
+        approved_counts = (
+            Comment.objects.filter(post=models.OuterRef("pk"), approved=True)
+            .order_by()
+            .values("post")
+            .annotate(count=models.Count("pk"))
+            .values("count")
+        )
+        return self.update(
+            approved_comment_count=Coalesce(
+                models.Subquery(approved_counts), 0
+            )
+        )
+
+
+class CommentQuerySet(models.QuerySet):
+    """
+    Query-shaping methods for :model:`blog.Comment`.
+    """
+
+    # The columns used by the comment thread on the post details page.
+    THREAD_FIELDS = (
+        "post",
+        "author__username",
+        "body",
+        "approved",
+        "created_on",
+    )
+
+    def with_author(self):
+        """Fetch each comment's author in the same query as the comment."""
+        return self.select_related("author")
+
+    def visible_to(self, user):
+        """
+        Return approved comments plus `user`'s own comments awaiting approval.
+        """
+        visible = models.Q(approved=True)
+        if user.is_authenticated:
+            visible |= models.Q(author=user)
+        return self.filter(visible)
+
+    def for_thread(self):
+        """
+        Return comments with only the columns the comment thread renders.
+        """
+        return self.with_author().only(*self.THREAD_FIELDS)
+
+    def set_approved(self, approved):
+        """
+        Approve or unapprove every comment in one UPDATE, then recount the
+        affected posts' approved comments in one more.
+
+        Args:
+            approved (bool): The comments' new approved status.
+
+        Returns:
+            int: The number of comments whose status changed.
+        """
+        with transaction.atomic():
+            changed = self.exclude(approved=approved)
+            post_ids = set(
+                changed.order_by().values_list("post", flat=True).distinct()
+            )
+            updated = changed.update(approved=approved)
+            Post.objects.filter(pk__in=post_ids).rebuild_comment_counts()
+        return updated
+
+    def delete_and_recount(self):
+        """
+        Delete every comment in one DELETE, then recount the affected posts'
+        approved comments in one UPDATE.
+
+        No comment is fetched and no delete signal is sent, so callers bump
+        the page cache's content version themselves.
+
+        Returns:
+            int: The number of comments deleted.
+        """
+        with transaction.atomic():
+            post_ids = set(
+                self.order_by().values_list("post", flat=True).distinct()
+            )
+            # delete() would fetch every comment to send its post_delete
+            # signals. Nothing references comments, so there's nothing to
+            # cascade, and the recount replaces the per-comment adjustments.
+            deleted = self.order_by()._raw_delete(self.db)
+            Post.objects.filter(pk__in=post_ids).rebuild_comment_counts()
+        return deleted
 
 
 class Post(models.Model):
@@ -16,7 +175,9 @@ class Post(models.Model):
         :model:`auth.User`.
     """
     title = models.CharField(max_length=200, unique=True)
-    slug = models.SlugField(max_length=200, unique=True)
+    slug = models.SlugField(
+        max_length=200, unique=True, validators=[validate_post_slug]
+    )
     author = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="blog_posts"
     )
@@ -26,13 +187,50 @@ class Post(models.Model):
     status = models.IntegerField(choices=STATUS, default=DRAFT)
     excerpt = models.TextField(blank=True)
     updated_on = models.DateTimeField(auto_now=True)
+    approved_comment_count = models.PositiveIntegerField(
+        default=0, editable=False
+    )
+    rendered_content = models.TextField(blank=True, editable=False)
+    has_image = models.BooleanField(default=False, editable=False)
+    image_derivatives = models.JSONField(
+        default=dict, blank=True, editable=False
+    )
+
+    # The name of the image field whose derivatives are stored.
+    image_field = "featured_image"
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         ordering = ["-created_on"]
+        indexes = [
+            models.Index(
+                fields=["status", "created_on"],
+                name="blog_post_published_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} | written by {self.author}"
 
+    def save(self, *args, **kwargs):
+        """
+        Save the post, rendering `content` into `rendered_content` first.
+
+        The featured image's derivatives are made once, when a new image is
+        saved.
+        """
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            # Imported here so workers that never save posts skip bleach.
+            from .rendering import render_content
+
+            self.rendered_content = render_content(self.content)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "rendered_content"}
+        super().save(*args, **kwargs)
+        refresh_derivatives(self, ("card", "masthead"))
+
 
 class Comment(models.Model):
     """
@@ -52,8 +250,99 @@ class Comment(models.Model):
     approved = models.BooleanField(default=False)
     created_on = models.DateTimeField(auto_now_add=True)
 
+    objects = CommentQuerySet.as_manager()
+
     class Meta:
         ordering = ["created_on"]
+        indexes = [
+            models.Index(
+                fields=["post", "approved", "created_on"],
+                name="blog_comment_thread_idx",
+            ),
+            # Used by the moderation filters in the admin.
+            models.Index(
+                fields=["approved", "created_on"],
+                name="blog_comment_moderation_idx",
+            ),
+        ]
+
+    # The post whose `approved_comment_count` includes this comment, if any.
+    _counted_post_id = None
 
     def __str__(self):
         return f"Comment {self.body} by {self.author}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        comment = super().from_db(db, field_names, values)
+        if comment.__dict__.get("approved"):
+            comment._counted_post_id = comment.post_id
+        return comment
+
+    def save(self, *args, **kwargs):
+        """
+        Save the comment and keep its post's approved comment count in step.
+
+        The count is adjusted from the row as stored, read under a row lock,
+        not from this instance, so when two moderators approve the same
+        comment at once only the first approval is counted.
+        """
+        with transaction.atomic():
+            stored = None
+            if not self._state.adding:
+                stored = (
+                    Comment.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list("post", "approved")
+                    .first()
+                )
+            super().save(*args, **kwargs)
+            post_id, approved = self.post_id, self.approved
+            update_fields = kwargs.get("update_fields")
+            if stored is not None and update_fields is not None:
+                # Fields left out of the UPDATE keep their stored values.
+                if not {"post", "post_id"} & set(update_fields):
+                    post_id = stored[0]
+                if "approved" not in update_fields:
+                    approved = stored[1]
+            counted_before = stored[0] if stored and stored[1] else None
+            counted_post_id = post_id if approved else None
+            if counted_post_id != counted_before:
+                _add_to_comment_count(counted_before, -1)
+                _add_to_comment_count(counted_post_id, 1)
+            self._counted_post_id = counted_post_id
+
+
+def _add_to_comment_count(post_id, amount):
+    """
+    Atomically add `amount` to a post's approved comment count.
+
+    The count never drops below zero, even if it was already out of step
+    after a bulk insert.
+
+    Args:
+        post_id (int): The post's ID. Nothing is updated if it's None.
+        amount (int): The number of comments to add. May be negative.
+    """
+    if post_id is not None:
+        Post.objects.filter(pk=post_id).update(
+            approved_comment_count=Greatest(
+                models.F("approved_comment_count") + amount, 0
+            )
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def _uncount_deleted_comment(sender, instance, origin=None, **kwargs):
+    """
+    Remove a deleted comment from its post's approved comment count.
+
+    Handled with a signal so that bulk and cascading deletes are counted too.
+    Comments deleted along with their posts are skipped, because the posts'
+    rows are being deleted too.
+    """
+    deleting_posts = isinstance(origin, Post) or (
+        isinstance(origin, models.QuerySet) and origin.model is Post
+    )
+    if not deleting_posts:
+        _add_to_comment_count(instance._counted_post_id, -1)
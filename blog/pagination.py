@@ -0,0 +1,151 @@
+"""
+Keyset (cursor) pagination for querysets ordered newest first.
+
+Pages are found by filtering on the `(created_on, pk)` of the row at the edge
+of the neighbouring page instead of using OFFSET, so every page costs the same
+no matter how deep it is.
+"""
+
+import base64
+from datetime import datetime
+from django.core.exceptions import BadRequest
+from django.db.models import Q
+
+
+def encode_cursor(obj):
+    """
+    Return an opaque, URL-safe cursor that points at `obj`.
+
+    Args:
+        obj (Model): A model instance with `created_on` and `pk` attributes.
+
+    Returns:
+        str: The cursor.
+    """
+    raw = f"{obj.created_on.isoformat()}|{obj.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Return the `(created_on, pk)` pair encoded in `cursor`.
+
+    Args:
+        cursor (str): A cursor made by :func:`encode_cursor`.
+
+    Raises:
+        BadRequest: If `cursor` isn't a valid cursor.
+
+    Returns:
+        tuple: The `created_on` datetime and the primary key.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded).decode()
+        created_on, pk = raw.split("|")
+        return datetime.fromisoformat(created_on), int(pk)
+    except ValueError as error:
+        raise BadRequest("Invalid page cursor.") from error
+
+
+class KeysetPage:
+    """
+    A page of rows found by :func:`keyset_page`.
+
+    Attributes:
+        object_list (list): The page's rows, newest first.
+        next_cursor (str):
+            The cursor for the page of older rows, or None if there isn't one.
+        previous_cursor (str):
+            The cursor for the page of newer rows, or None if there isn't one.
+    """
+
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def _keyset_query(queryset, per_page, before, after):
+    """
+    Return the query for a page of `queryset` and a function that turns its
+    rows into a :class:`KeysetPage`.
+    """
+    if before or not after:
+        queryset = queryset.order_by("-created_on", "-pk")
+        if before:
+            created_on, pk = decode_cursor(before)
+            queryset = queryset.filter(
+                Q(created_on__lt=created_on)
+                | Q(created_on=created_on, pk__lt=pk)
+            )
+    else:
+        created_on, pk = decode_cursor(after)
+        queryset = queryset.order_by("created_on", "pk").filter(
+            Q(created_on__gt=created_on) | Q(created_on=created_on, pk__gt=pk)
+        )
+
+    def to_page(rows):
+        has_more, rows = len(rows) > per_page, rows[:per_page]
+        if before or not after:
+            has_next, has_previous = has_more, bool(before)
+        else:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        next_cursor = encode_cursor(rows[-1]) if rows and has_next else None
+        previous_cursor = (
+            encode_cursor(rows[0]) if rows and has_previous else None
+        )
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+    return queryset[: per_page + 1], to_page
+
+
+def keyset_page(queryset, per_page, before=None, after=None):
+    """
+    Return one page of `queryset`, newest first.
+
+    One extra row is fetched to find out whether there's another page in the
+    direction of travel, so no COUNT query is needed.
+
+    Args:
+        queryset (QuerySet): The rows to paginate.
+        per_page (int): The maximum number of rows on the page.
+        before (str):
+            A cursor. If given, the page holds the rows just older than it.
+        after (str):
+            A cursor. If given and `before` isn't, the page holds the rows
+            just newer than it.
+
+    Raises:
+        BadRequest: If a cursor isn't a valid cursor.
+
+    Returns:
+        KeysetPage: The page. The first page is returned if no cursor is
+        given.
+    """
+    query, to_page = _keyset_query(queryset, per_page, before, after)
+    return to_page(list(query))
+
+
+async def akeyset_page(queryset, per_page, before=None, after=None):
+    """
+    An async version of :func:`keyset_page` that uses the async ORM.
+    """
+    query, to_page = _keyset_query(queryset, per_page, before, after)
+    return to_page([row async for row in query])
@@ -0,0 +1,145 @@
+"""
+Turn the raw Summernote HTML of a blog post into HTML that is safe to serve.
+
+Rendering happens once, when a post is saved, and the result is stored in
+`Post.rendered_content` so that readers never pay for it.
+"""
+
+from urllib.parse import urlsplit
+
+import bleach
+from bleach.css_sanitizer import CSSSanitizer
+from bleach.html5lib_shim import Filter
+
+ALLOWED_TAGS = frozenset(
+    {
+        "a",
+        "b",
+        "blockquote",
+        "br",
+        "code",
+        "div",
+        "em",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "hr",
+        "i",
+        "iframe",
+        "img",
+        "li",
+        "ol",
+        "p",
+        "pre",
+        "s",
+        "span",
+        "strike",
+        "strong",
+        "sub",
+        "sup",
+        "table",
+        "tbody",
+        "td",
+        "th",
+        "thead",
+        "tr",
+        "u",
+        "ul",
+    }
+)
+# Summernote sizes, aligns and floats images and text with inline styles.
+ALLOWED_CSS_PROPERTIES = frozenset(
+    {
+        "background-color",
+        "color",
+        "float",
+        "font-style",
+        "font-weight",
+        "height",
+        "line-height",
+        "margin",
+        "margin-bottom",
+        "margin-left",
+        "margin-right",
+        "margin-top",
+        "max-width",
+        "text-align",
+        "text-decoration",
+        "width",
+    }
+)
+# Summernote's video button embeds players from these hosts.
+EMBED_HOSTS = frozenset(
+    {
+        "player.vimeo.com",
+        "www.youtube.com",
+        "www.youtube-nocookie.com",
+    }
+)
+IFRAME_ATTRIBUTES = frozenset(
+    {"width", "height", "frameborder", "allowfullscreen", "style"}
+)
+
+
+def _allow_iframe_attribute(tag, name, value):
+    """
+    Keep an iframe's sizing attributes, and its `src` only if it is an https
+    URL on one of the video hosts in `EMBED_HOSTS`.
+    """
+    if name == "src":
+        url = urlsplit(value)
+        return url.scheme == "https" and url.hostname in EMBED_HOSTS
+    return name in IFRAME_ATTRIBUTES
+
+
+ALLOWED_ATTRIBUTES = {
+    "*": ["class", "style"],
+    "a": ["href", "title", "target"],
+    "iframe": _allow_iframe_attribute,
+    "img": ["src", "alt", "title", "width", "height"],
+    "td": ["colspan", "rowspan"],
+    "th": ["colspan", "rowspan"],
+}
+
+
+class _PostProcessFilter(Filter):
+    """
+    Lazy-load images and embeds, and stop links that open new tabs from
+    reaching back into the blog's window.
+    """
+
+    def __iter__(self):
+        for token in super().__iter__():
+            if token["type"] in ("StartTag", "EmptyTag"):
+                attributes = token["data"]
+                if token["name"] in ("img", "iframe"):
+                    attributes[(None, "loading")] = "lazy"
+                elif token["name"] == "a" and (None, "target") in attributes:
+                    attributes[(None, "rel")] = "noopener noreferrer"
+            yield token
+
+
+def render_content(content):
+    """
+    Return sanitized, post-processed HTML for a post's raw content.
+
+    Args:
+        content (str): The raw HTML entered in the Summernote editor.
+
+    Returns:
+        str: HTML that is safe to output with the `safe` filter.
+    """
+    # Cleaner instances aren't thread-safe, so each call gets its own.
+    cleaner = bleach.Cleaner(
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        css_sanitizer=CSSSanitizer(
+            allowed_css_properties=ALLOWED_CSS_PROPERTIES
+        ),
+        strip=True,
+        filters=[_PostProcessFilter],
+    )
+    return cleaner.clean(content)
@@ -0,0 +1,115 @@
+"""
+Full-text search over blog posts.
+
+PostgreSQL keeps a weighted `tsvector` of each post in a generated
+`search_vector` column with a GIN index. SQLite, used when testing, keeps an
+FTS5 table that is updated whenever a post is saved or deleted. Both indexes
+are created by the `blog` migrations and cover the text of the rendered
+content, not the raw HTML entered in the editor.
+"""
+
+import re
+from html import unescape
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from django.utils.html import strip_tags
+
+FTS_TABLE = "blog_post_fts"
+
+
+def search_text(html):
+    """
+    Return the text of a post's rendered HTML, without its markup, so that
+    tag and attribute names aren't searched.
+
+    Args:
+        html (str): The post's `rendered_content`.
+
+    Returns:
+        str: The text readers see.
+    """
+    return unescape(strip_tags(html))
+
+
+def index_post(sender, instance, using, **kwargs):
+    """
+    Update a saved post's row in the SQLite FTS5 table.
+
+    PostgreSQL's generated column keeps itself up to date.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [instance.pk]
+        )
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content) "
+            "VALUES (%s, %s, %s, %s)",
+            [
+                instance.pk,
+                instance.title,
+                instance.excerpt,
+                search_text(instance.rendered_content),
+            ],
+        )
+
+
+def unindex_post(sender, instance, using, **kwargs):
+    """
+    Remove a deleted post from the SQLite FTS5 table.
+    """
+    connection = connections[using]
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [instance.pk]
+            )
+
+
+def search_posts(queryset, terms):
+    """
+    Return the posts in `queryset` that match `terms`, best matches first.
+
+    Each post is annotated with `search_rank`, where higher is better.
+
+    Args:
+        queryset (QuerySet): The :model:`blog.Post` instances to search.
+        terms (str): The words to search for, as typed by the reader.
+
+    Raises:
+        NotImplementedError: If the database has no search support.
+
+    Returns:
+        QuerySet: The matching posts.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        tsquery = "websearch_to_tsquery('english', %s)"
+        match = f'"blog_post"."search_vector" @@ {tsquery}'
+        rank = f'ts_rank("blog_post"."search_vector", {tsquery})'
+        params = [terms]
+    elif vendor == "sqlite":
+        words = re.findall(r"\w+", terms)
+        if not words:
+            return queryset.none()
+        # Quoting each word stops FTS5 reading it as query syntax.
+        fts_query = " ".join(f'"{word}"' for word in words)
+        match = (
+            f'"blog_post"."id" IN (SELECT rowid FROM {FTS_TABLE} '
+            f"WHERE {FTS_TABLE} MATCH %s)"
+        )
+        rank = (
+            f"(SELECT -bm25({FTS_TABLE}, 10.0, 5.0, 1.0) FROM {FTS_TABLE} "
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = "blog_post"."id")'
+        )
+        params = [fts_query]
+    else:
+        raise NotImplementedError(f"Search isn't supported on {vendor}.")
+    return (
+        queryset.filter(RawSQL(match, params, output_field=BooleanField()))
+        .annotate(search_rank=RawSQL(rank, params, output_field=FloatField()))
+        .order_by("-search_rank", "-created_on")
+    )
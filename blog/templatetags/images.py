@@ -0,0 +1,81 @@
+from django import template
+from codestar.images import FORMATS, default_derivatives
+
+register = template.Library()
+
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp", "jpg": "image/jpeg"}
+
+
+@register.filter
+def image_url(image):
+    """
+    Return the URL of an image field's value.
+
+    Building a Cloudinary URL is relatively slow, so the URL is remembered on
+    the value and built at most once per object.
+
+    Args:
+        image (CloudinaryResource): An uploaded image.
+
+    Returns:
+        str: The image's URL.
+    """
+    url = getattr(image, "_memoized_url", None)
+    if url is None:
+        url = image.url
+        image._memoized_url = url
+    return url
+
+
+@register.inclusion_tag("blog/responsive_image.html")
+def responsive_image(
+    owner,
+    variant,
+    alt,
+    default="images/default.jpg",
+    sizes="100vw",
+    css_class="",
+    style="",
+):
+    """
+    Render a `picture` element for one variant of a model's image.
+
+    Uses the precomputed `has_image` and `image_derivatives` fields, so no
+    image URL is built. If the derivatives haven't been built yet, the
+    original image is shown instead.
+
+    Args:
+        owner (Model):
+            A :model:`blog.Post` or :model:`about.About`. If it has no image,
+            `default` is shown.
+        variant (str): The variant to show, such as "card".
+        alt (str): The image's alternative text.
+        default (str): The static default image's path.
+        sizes (str): The `sizes` attribute for the browser.
+        css_class (str): The `img` element's classes.
+        style (str): The `img` element's inline style.
+
+    Template:
+        :template:`blog/responsive_image.html`
+    """
+    context = {
+        "alt": alt,
+        "sizes": sizes,
+        "css_class": css_class,
+        "style": style,
+    }
+    if getattr(owner, "has_image", False):
+        srcsets = owner.image_derivatives.get(variant)
+        if srcsets is None:
+            context["src"] = image_url(getattr(owner, owner.image_field))
+            return context
+    else:
+        srcsets = default_derivatives(default)[variant]
+    fallback = FORMATS[-1]
+    context["sources"] = [
+        (MIME_TYPES[image_format], srcsets[image_format])
+        for image_format in FORMATS[:-1]
+    ]
+    context["srcset"] = srcsets[fallback]
+    context["src"] = srcsets["src"]
+    return context
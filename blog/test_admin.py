@@ -0,0 +1,148 @@
+from unittest import mock
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from codestar.admin import EstimatedCountPaginator
+from .models import Comment, Post, PUBLISHED
+
+
+class TestCommentAdmin(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="moderator", password="myPassword"
+        )
+        self.posts = [
+            Post.objects.create(
+                title=f"Post {index}",
+                slug=f"post-{index}",
+                author=self.user,
+                content="Content",
+                status=PUBLISHED,
+            )
+            for index in range(2)
+        ]
+        self.comments = Comment.objects.bulk_create(
+            Comment(post=post, author=self.user, body=f"Comment {index}")
+            for post in self.posts
+            for index in range(3)
+        )
+        self.client.force_login(self.user)
+        self.changelist = reverse("admin:blog_comment_changelist")
+
+    def _run(self, action, comments, **data):
+        return self.client.post(
+            self.changelist,
+            {
+                "action": action,
+                ACTION_CHECKBOX_NAME: [comment.pk for comment in comments],
+                **data,
+            },
+            follow=True,
+        )
+
+    def _counts(self):
+        return list(
+            Post.objects.order_by("pk").values_list(
+                "approved_comment_count", flat=True
+            )
+        )
+
+    def test_approve_and_unapprove_recount_posts(self):
+        response = self._run("approve_comments", self.comments[:4])
+        self.assertContains(response, "4 comments approved.")
+        self.assertEqual(self._counts(), [3, 1])
+        self._run("unapprove_comments", self.comments[2:4])
+        self.assertEqual(self._counts(), [2, 0])
+        self.assertEqual(Comment.objects.filter(approved=True).count(), 2)
+
+    def test_delete_asks_for_confirmation(self):
+        response = self._run("delete_selected", self.comments[1:4])
+        self.assertTemplateUsed(
+            response, "admin/delete_selected_confirmation.html"
+        )
+        self.assertEqual(Comment.objects.count(), 6)
+
+    def test_delete_recounts_posts_and_logs_deletions(self):
+        self._run("approve_comments", self.comments)
+        response = self._run(
+            "delete_selected", self.comments[1:4], post="yes"
+        )
+        self.assertContains(response, "Successfully deleted 3 comments.")
+        self.assertEqual(self._counts(), [1, 2])
+        self.assertEqual(Comment.objects.count(), 3)
+        self.assertEqual(
+            LogEntry.objects.filter(action_flag=DELETION).count(), 3
+        )
+
+    def test_bulk_actions_use_set_based_queries(self):
+        queryset = Comment.objects.filter(post=self.posts[0])
+        with self.assertNumQueries(5) as queries:
+            self.assertEqual(queryset.set_approved(True), 3)
+        # Ordering columns would make DISTINCT return a row per comment.
+        select = next(
+            query["sql"] for query in queries if "DISTINCT" in query["sql"]
+        )
+        self.assertNotIn("created_on", select)
+        self.assertEqual(self._counts(), [3, 0])
+        with self.assertNumQueries(5):
+            self.assertEqual(queryset.delete_and_recount(), 3)
+        self.assertEqual(self._counts(), [0, 0])
+
+    def test_changelist_queries_dont_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(self.changelist)
+        Comment.objects.bulk_create(
+            Comment(post=post, author=user, body="More")
+            for post in self.posts
+            for user in (
+                User.objects.create_user(username=f"reader-{post.pk}"),
+            )
+            for _ in range(5)
+        )
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(self.changelist)
+        self.assertEqual(len(many), len(few))
+
+
+class TestPostAdmin(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="editor", password="myPassword"
+        )
+        for title in ("Roasting coffee", "Brewing tea"):
+            Post.objects.create(
+                title=title,
+                slug=title.lower().replace(" ", "-"),
+                author=self.user,
+                content=f"All about {title.lower()}",
+            )
+        self.client.force_login(self.user)
+        self.changelist = reverse("admin:blog_post_changelist")
+
+    def test_changelist_skips_large_text_fields(self):
+        response = self.client.get(self.changelist)
+        post = response.context["cl"].result_list[0]
+        self.assertEqual(
+            post.get_deferred_fields() & {"content", "rendered_content"},
+            {"content", "rendered_content"},
+        )
+
+    def test_search_uses_full_text_index(self):
+        response = self.client.get(self.changelist, {"q": "coffee"})
+        titles = [post.title for post in response.context["cl"].result_list]
+        self.assertEqual(titles, ["Roasting coffee"])
+
+    def test_large_unfiltered_changelist_uses_estimated_count(self):
+        with mock.patch("codestar.admin.estimated_row_count") as estimate:
+            estimate.return_value = 50000
+            paginator = EstimatedCountPaginator(Post.objects.all(), 20)
+            self.assertEqual(paginator.count, 50000)
+            filtered = Post.objects.filter(title__startswith="Roasting")
+            paginator = EstimatedCountPaginator(filtered, 20)
+            self.assertEqual(paginator.count, 1)
@@ -0,0 +1,90 @@
+from http import HTTPStatus
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from .models import Comment, Post, DRAFT, PUBLISHED
+
+
+class TestPostApi(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="author", password="myPassword"
+        )
+        self.posts = [
+            Post.objects.create(
+                title=f"Post {index}",
+                slug=f"post-{index}",
+                author=self.user,
+                excerpt=f"Excerpt {index}",
+                content=f"<p>Content {index}</p>",
+                status=PUBLISHED,
+            )
+            for index in range(25)
+        ]
+        Post.objects.create(
+            title="Draft", slug="draft", author=self.user, status=DRAFT
+        )
+
+    def test_post_list_pages_with_cursors_and_sparse_fields(self):
+        path = reverse("api_post_list")
+        with self.assertNumQueries(1):
+            response = self.client.get(path, {"fields": "title,slug"})
+        data = response.json()
+        self.assertEqual(len(data["results"]), 20)
+        self.assertEqual(
+            data["results"][0], {"title": "Post 24", "slug": "post-24"}
+        )
+        response = self.client.get(
+            path, {"fields": "slug", "before": data["next_cursor"]}
+        )
+        data = response.json()
+        slugs = [post["slug"] for post in data["results"]]
+        expected = [f"post-{index}" for index in range(4, -1, -1)]
+        self.assertEqual(slugs, expected)
+        self.assertIsNone(data["next_cursor"])
+
+    def test_post_list_skips_unrequested_columns(self):
+        with self.assertNumQueries(1) as queries:
+            self.client.get(reverse("api_post_list"), {"fields": "title"})
+        sql = queries.captured_queries[0]["sql"]
+        self.assertNotIn("content", sql)
+        self.assertNotIn("auth_user", sql)
+
+    def test_unknown_field_is_a_bad_request(self):
+        response = self.client.get(
+            reverse("api_post_list"), {"fields": "title,password"}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_post_detail_returns_rendered_content(self):
+        response = self.client.get(
+            reverse("api_post_detail", args=["post-3"])
+        )
+        data = response.json()
+        self.assertEqual(data["content"], "<p>Content 3</p>")
+        self.assertEqual(data["author"], "author")
+        response = self.client.get(reverse("api_post_detail", args=["draft"]))
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_comment_list_returns_approved_comments_only(self):
+        post = self.posts[0]
+        Comment.objects.create(
+            post=post, author=self.user, body="Approved", approved=True
+        )
+        Comment.objects.create(post=post, author=self.user, body="Pending")
+        response = self.client.get(
+            reverse("api_comment_list", args=[post.slug])
+        )
+        bodies = [comment["body"] for comment in response.json()["results"]]
+        self.assertEqual(bodies, ["Approved"])
+
+    def test_unchanged_response_is_not_modified_without_queries(self):
+        path = reverse("api_post_detail", args=["post-3"])
+        etag = self.client.get(path)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        self.posts[3].save()
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
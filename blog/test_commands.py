@@ -0,0 +1,237 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from io import StringIO
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.test import override_settings
+from django.utils import timezone
+from whitenoise.middleware import WhiteNoiseMiddleware
+from .management.commands.bundle_assets import (
+    BUNDLE_PATH,
+    bundle_css,
+    template_icons,
+)
+from .management.commands.profile_imports import STARTUP_MARKER, import_times
+from .models import Post, PUBLISHED
+
+
+class TestExportStaticSite(TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+        self.user = User.objects.create_user(
+            username="author", password="myPassword"
+        )
+        for index in range(7):
+            Post.objects.create(
+                title=f"Post {index}",
+                author=self.user,
+                slug=f"post-{index}",
+                content=f"Content {index}",
+                status=PUBLISHED,
+            )
+
+    def _export(self, workers=1):
+        call_command(
+            "export_static_site",
+            output=self.output_dir,
+            workers=workers,
+            stdout=StringIO(),
+        )
+
+    def _read(self, *path):
+        with open(os.path.join(self.output_dir, *path, "index.html")) as file:
+            return file.read()
+
+    def test_exports_posts_and_index_pages(self):
+        """Test that every post and home page is written with static links"""
+
+        self._export()
+        self.assertIn("Content 3", self._read("post-3"))
+        self.assertIn('href="/page/2/"', self._read())
+        self.assertIn('href="/"', self._read("page", "2"))
+
+    def test_incremental_export_only_renders_changed_posts(self):
+        """Test that unchanged posts aren't re-rendered"""
+
+        self._export()
+        unchanged = os.path.join(self.output_dir, "post-1", "index.html")
+        os.remove(unchanged)
+        post = Post.objects.get(slug="post-2")
+        post.content = "Changed content"
+        post.save()
+        Post.objects.filter(slug="post-3").delete()
+        self._export()
+        self.assertFalse(os.path.exists(unchanged))
+        self.assertIn("Changed content", self._read("post-2"))
+        self.assertFalse(
+            os.path.exists(os.path.join(self.output_dir, "post-3"))
+        )
+
+    def test_post_named_page_survives_export(self):
+        """Test that home pages don't overwrite a post with the slug page"""
+
+        Post.objects.filter(slug="post-0").update(slug="page")
+        self._export()
+        self._export()
+        self.assertIn("Content 0", self._read("page"))
+        self.assertIn('href="/"', self._read("page", "2"))
+        Post.objects.filter(slug__in=["post-1", "post-2"]).delete()
+        self._export()
+        self.assertIn("Content 0", self._read("page"))
+        self.assertFalse(
+            os.path.exists(os.path.join(self.output_dir, "page", "2"))
+        )
+
+    def test_parallel_export_writes_every_page(self):
+        """Test that pages rendered by worker processes are all written"""
+
+        self._export(workers=2)
+        for index in range(7):
+            self.assertIn(f"Content {index}", self._read(f"post-{index}"))
+        self.assertIn('href="/"', self._read("page", "2"))
+
+
+class TestBuildStatic(SimpleTestCase):
+
+    def setUp(self):
+        static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_root)
+        storage = "codestar.storage.MinifiedCompressedManifestStorage"
+        # Only the project's own files, to keep the build quick.
+        finder = "django.contrib.staticfiles.finders.FileSystemFinder"
+        settings_override = override_settings(
+            STATIC_ROOT=static_root,
+            STATICFILES_FINDERS=[finder],
+            STORAGES={
+                "default": {
+                    "BACKEND": "django.core.files.storage.FileSystemStorage"
+                },
+                "staticfiles": {"BACKEND": storage},
+            },
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_assets_are_minified_compressed_and_cached_forever(self):
+        from django.contrib.staticfiles.storage import staticfiles_storage
+
+        stdout = StringIO()
+        call_command("build_static", stdout=stdout)
+        self.assertIn("css/style.css", stdout.getvalue())
+        hashed_name = staticfiles_storage.stored_name("css/style.css")
+        self.assertNotEqual(hashed_name, "css/style.css")
+        hashed_path = staticfiles_storage.path(hashed_name)
+        source_path = os.path.join("static", "css", "style.css")
+        self.assertLess(
+            os.path.getsize(hashed_path), os.path.getsize(source_path)
+        )
+        for suffix in (".gz", ".br"):
+            self.assertTrue(os.path.exists(hashed_path + suffix))
+
+        middleware = WhiteNoiseMiddleware(lambda request: HttpResponse())
+        request = RequestFactory().get(
+            staticfiles_storage.url("css/style.css"),
+            HTTP_ACCEPT_ENCODING="gzip, br",
+        )
+        response = middleware(request)
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn("immutable", response["Cache-Control"])
+
+
+class TestBundleAssets(SimpleTestCase):
+
+    def test_bundle_is_up_to_date(self):
+        with open(BUNDLE_PATH, encoding="utf-8") as file:
+            bundle = file.read()
+        self.assertEqual(
+            bundle,
+            bundle_css(template_icons()),
+            "Run manage.py bundle_assets to rebuild static/css/bundle.css.",
+        )
+
+
+class TestBenchmarkConnections(TestCase):
+
+    def test_reports_both_connection_modes(self):
+        user = User.objects.create_user(username="author", password="pw")
+        Post.objects.create(
+            title="Post", author=user, slug="post", status=PUBLISHED
+        )
+        stdout = StringIO()
+        call_command("benchmark_connections", requests=3, stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn("New connection per request:", output)
+        self.assertIn("Persistent connection:", output)
+
+
+class TestPurgeSessions(TestCase):
+
+    def test_deletes_only_expired_sessions_in_batches(self):
+        for _ in range(5):
+            SessionStore().create()
+        Session.objects.update(expire_date=timezone.now() - timedelta(1))
+        live = SessionStore()
+        live.create()
+        stdout = StringIO()
+        with self.assertNumQueries(6):
+            call_command("purge_sessions", batch_size=2, stdout=stdout)
+        self.assertIn("Deleted 5 expired sessions.", stdout.getvalue())
+        self.assertEqual(
+            list(Session.objects.values_list("pk", flat=True)),
+            [live.session_key],
+        )
+
+
+class TestProfileImports(SimpleTestCase):
+
+    def test_import_times_counts_top_level_imports_by_package(self):
+        output = "\n".join(
+            [
+                "import time:       100 |        100 | site",
+                STARTUP_MARKER,
+                "import time:        50 |         50 |   bleach.sanitizer",
+                "import time:        20 |         70 | bleach",
+                "import time:        30 |        100 | blog.models",
+                "import time:        10 |         10 | django.contrib.admin",
+                "import time: 5 | 5 | django.contrib.admin.sites",
+            ]
+        )
+        self.assertEqual(
+            import_times(output),
+            {"bleach": 70, "blog": 100, "django.contrib.admin": 15},
+        )
+
+    def test_reports_installed_apps(self):
+        stdout = StringIO()
+        call_command("profile_imports", limit=50, stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn("Started in", output)
+        self.assertRegex(output, r"\nblog +[\d.]+ +[\d.]+  blog\n")
+
+    def test_public_urls_skip_admin_only_modules(self):
+        """Test that admin-only modules load when the admin is first used"""
+
+        script = (
+            "import sys, django; django.setup(); "
+            "from django.urls import reverse; reverse('home'); "
+            "lazy = ('blog.admin', 'django_summernote.forms', 'bleach'); "
+            "print(*(name in sys.modules for name in lazy)); "
+            "reverse('admin:index'); print('blog.admin' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        self.assertEqual(result.stdout.split(), ["False"] * 3 + ["True"])
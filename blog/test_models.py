@@ -0,0 +1,346 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+from PIL import Image
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.exceptions import ValidationError
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from about.cache import current_about
+from about.models import About
+from codestar.images import FORMATS
+from .models import Comment, Post, PUBLISHED
+
+
+class TestApprovedCommentCount(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="commenter", password="myPassword"
+        )
+        self.post = Post.objects.create(
+            title="Blog title",
+            author=self.user,
+            slug="blog-slug",
+            content="Blog content",
+            status=PUBLISHED,
+        )
+
+    def _comment_count(self):
+        self.post.refresh_from_db()
+        return self.post.approved_comment_count
+
+    def test_count_follows_approval(self):
+        """Test that approving and unapproving a comment updates the count"""
+
+        comment = Comment.objects.create(
+            post=self.post, author=self.user, body="Body"
+        )
+        self.assertEqual(self._comment_count(), 0)
+        comment.approved = True
+        comment.save()
+        self.assertEqual(self._comment_count(), 1)
+        comment.save()
+        self.assertEqual(self._comment_count(), 1)
+        comment = Comment.objects.get(pk=comment.pk)
+        comment.approved = False
+        comment.save()
+        self.assertEqual(self._comment_count(), 0)
+
+    def test_count_follows_deletes(self):
+        """Test that single and bulk deletes update the count"""
+
+        for _ in range(3):
+            Comment.objects.create(
+                post=self.post, author=self.user, body="Body", approved=True
+            )
+        Comment.objects.first().delete()
+        self.assertEqual(self._comment_count(), 2)
+        Comment.objects.all().delete()
+        self.assertEqual(self._comment_count(), 0)
+
+    def test_concurrent_approvals_count_once(self):
+        """Test that approving an already approved comment isn't counted"""
+
+        comment = Comment.objects.create(
+            post=self.post, author=self.user, body="Body"
+        )
+        first = Comment.objects.get(pk=comment.pk)
+        second = Comment.objects.get(pk=comment.pk)
+        for moderator_copy in (first, second):
+            moderator_copy.approved = True
+            moderator_copy.save()
+        self.assertEqual(self._comment_count(), 1)
+        comment.body = "Edited"
+        comment.save(update_fields=["body"])
+        self.assertEqual(self._comment_count(), 1)
+
+    def test_deleting_a_post_skips_comment_count_updates(self):
+        """Test that cascaded comment deletes don't update the dying post"""
+
+        Comment.objects.bulk_create(
+            Comment(
+                post=self.post, author=self.user, body="Body", approved=True
+            )
+            for _ in range(5)
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.post.delete()
+        statements = [query["sql"].split()[0] for query in queries]
+        self.assertNotIn("UPDATE", statements)
+        self.assertFalse(Comment.objects.exists())
+
+    def test_rebuild_comment_counts_command(self):
+        """Test that the command finds and fixes wrong counts"""
+
+        Comment.objects.bulk_create(
+            Comment(
+                post=self.post, author=self.user, body="Body", approved=True
+            )
+            for _ in range(4)
+        )
+        output = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("rebuild_comment_counts", check=True, stdout=output)
+        call_command("rebuild_comment_counts", stdout=output)
+        self.assertEqual(self._comment_count(), 4)
+        call_command("rebuild_comment_counts", check=True, stdout=output)
+
+
+class TestRenderedContent(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="author", password="myPassword"
+        )
+
+    def test_content_is_sanitized_on_save(self):
+        """Test that saving a post stores sanitized HTML"""
+
+        post = Post.objects.create(
+            title="Blog title",
+            author=self.user,
+            slug="blog-slug",
+            content='<p onclick="steal()">Hi<script>x</script></p>',
+        )
+        self.assertEqual(post.rendered_content, "<p>Hix</p>")
+
+    def test_vetted_inline_styles_are_kept(self):
+        """Test that Summernote's sizing and alignment styles survive"""
+
+        post = Post.objects.create(
+            title="Blog title",
+            author=self.user,
+            slug="blog-slug",
+            content=(
+                '<p style="text-align: center; position: fixed;">'
+                '<img src="https://example.com/a.png" style="width: 50%;">'
+                "</p>"
+            ),
+        )
+        self.assertEqual(
+            post.rendered_content,
+            '<p style="text-align: center;">'
+            '<img src="https://example.com/a.png" style="width: 50%;" '
+            'loading="lazy"></p>',
+        )
+
+    def test_only_video_embeds_keep_their_source(self):
+        """Test that iframes keep a src only for the video hosts"""
+
+        post = Post.objects.create(
+            title="Blog title",
+            author=self.user,
+            slug="blog-slug",
+            content=(
+                '<iframe src="https://www.youtube.com/embed/abc" '
+                'width="640" onload="steal()"></iframe>'
+                '<iframe src="https://example.com/embed/abc"></iframe>'
+            ),
+        )
+        self.assertEqual(
+            post.rendered_content,
+            '<iframe src="https://www.youtube.com/embed/abc" width="640" '
+            'loading="lazy"></iframe><iframe loading="lazy"></iframe>',
+        )
+
+    def test_render_posts_command_backfills_missing_content(self):
+        """Test that the command renders posts saved without rendering"""
+
+        post = Post.objects.create(
+            title="Blog title",
+            author=self.user,
+            slug="blog-slug",
+            content='<img src="https://example.com/a.png">',
+        )
+        Post.objects.update(rendered_content="")
+        call_command("render_posts", missing=True, stdout=StringIO())
+        updated_on = post.updated_on
+        post.refresh_from_db()
+        self.assertEqual(
+            post.rendered_content,
+            '<img src="https://example.com/a.png" loading="lazy">',
+        )
+        # Clients holding the old HTML don't get a 304 for the new one.
+        self.assertGreater(post.updated_on, updated_on)
+
+
+class TestPostSlug(TestCase):
+
+    def test_slugs_of_other_pages_are_rejected(self):
+        """Test that a post can't take the URL of the search page"""
+
+        user = User.objects.create_user(username="author")
+        post = Post(title="Search", author=user, slug="search", content="x")
+        with self.assertRaises(ValidationError) as context:
+            post.full_clean()
+        self.assertIn("slug", context.exception.message_dict)
+
+
+class TestImageDerivatives(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        os.makedirs(os.path.join(self.media_root, "uploads"))
+        Image.new("RGB", (2000, 1000), "teal").save(
+            os.path.join(self.media_root, "uploads", "photo.jpg")
+        )
+        self.user = User.objects.create_user(
+            username="author", password="myPassword"
+        )
+
+    def test_derivatives_are_made_once_on_upload(self):
+        """Test that saving a new image writes and stores its derivatives"""
+
+        settings = {
+            "IMAGE_BACKEND": "codestar.images.LocalImageBackend",
+            "MEDIA_ROOT": self.media_root,
+        }
+        with self.settings(**settings):
+            post = Post.objects.create(
+                title="Blog title",
+                author=self.user,
+                slug="blog-slug",
+                content="Content",
+                featured_image="uploads/photo.jpg",
+            )
+        derivatives_dir = os.path.join(
+            self.media_root, "derivatives", "uploads"
+        )
+        thumbnail = os.path.join(derivatives_dir, "photo-400w.webp")
+        with Image.open(thumbnail) as image:
+            self.assertEqual(image.size, (400, 200))
+        self.assertIn(
+            "/media/derivatives/uploads/photo-800w.avif 800w",
+            post.image_derivatives["card"]["avif"],
+        )
+        post.refresh_from_db()
+        self.assertTrue(post.has_image)
+        self.assertEqual(
+            post.image_derivatives["public_id"], "uploads/photo.jpg"
+        )
+
+    def test_placeholder_has_no_derivatives(self):
+        """Test that posts without an image don't call the image backend"""
+
+        post = Post.objects.create(
+            title="Blog title",
+            author=self.user,
+            slug="blog-slug",
+            content="Content",
+        )
+        self.assertFalse(post.has_image)
+        self.assertEqual(post.image_derivatives, {})
+
+    @mock.patch("cloudinary.uploader.explicit")
+    def test_cloudinary_derivatives_are_requested_once_per_width(
+        self, explicit
+    ):
+        """Test that widths shared by variants are only requested once"""
+
+        with self.settings(
+            IMAGE_BACKEND="codestar.images.CloudinaryImageBackend"
+        ):
+            Post.objects.create(
+                title="Blog title",
+                author=self.user,
+                slug="blog-slug",
+                content="Content",
+                featured_image="uploads/photo",
+            )
+        eager = explicit.call_args.kwargs["eager"]
+        widths = [(options["width"], options["format"]) for options in eager]
+        self.assertEqual(len(widths), len(set(widths)))
+        self.assertEqual(len(widths), 3 * len(FORMATS))
+
+    @mock.patch("cloudinary.uploader.explicit", side_effect=OSError)
+    def test_failed_derivatives_dont_fail_the_save(self, explicit):
+        """Test that an image API error is logged and retried on next save"""
+
+        with self.settings(
+            IMAGE_BACKEND="codestar.images.CloudinaryImageBackend"
+        ), self.assertLogs("codestar.images", "ERROR"):
+            post = Post.objects.create(
+                title="Blog title",
+                author=self.user,
+                slug="blog-slug",
+                content="Content",
+                featured_image="uploads/photo",
+            )
+        post.refresh_from_db()
+        self.assertTrue(post.has_image)
+        self.assertEqual(post.image_derivatives, {})
+        explicit.side_effect = None
+        with self.settings(
+            IMAGE_BACKEND="codestar.images.CloudinaryImageBackend"
+        ):
+            post.save()
+        self.assertEqual(explicit.call_count, 2)
+        self.assertIn("card", post.image_derivatives)
+
+    @mock.patch("cloudinary.uploader.explicit")
+    def test_command_keeps_derivatives_it_fails_to_rebuild(self, explicit):
+        """Test that an image API error leaves stored derivatives alone"""
+
+        with self.settings(
+            IMAGE_BACKEND="codestar.images.CloudinaryImageBackend"
+        ):
+            post = Post.objects.create(
+                title="Blog title",
+                author=self.user,
+                slug="blog-slug",
+                content="Content",
+                featured_image="uploads/photo",
+            )
+            explicit.side_effect = OSError
+            with self.assertLogs("codestar.images", "ERROR"):
+                call_command("build_image_derivatives", stdout=StringIO())
+        derivatives = post.image_derivatives
+        post.refresh_from_db()
+        self.assertEqual(post.image_derivatives, derivatives)
+
+    def test_command_refreshes_the_cached_about(self):
+        """Test that rebuilt About derivatives reach the cached record"""
+
+        with self.settings(
+            IMAGE_BACKEND="codestar.images.CloudinaryImageBackend"
+        ), mock.patch("cloudinary.uploader.explicit"):
+            about = About.objects.create(
+                title="About",
+                content="Content",
+                profile_image="uploads/photo",
+            )
+            About.objects.update(image_derivatives={})
+            self.assertEqual(current_about().image_derivatives, {})
+            call_command("build_image_derivatives", stdout=StringIO())
+        about.refresh_from_db()
+        self.assertIn("profile", about.image_derivatives)
+        self.assertEqual(
+            current_about().image_derivatives, about.image_derivatives
+        )
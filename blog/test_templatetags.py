@@ -0,0 +1,59 @@
+from django.template import Context, Template
+from django.test import SimpleTestCase
+
+
+class FakeImage:
+    """An image field value that counts how often its URL is built."""
+
+    def __init__(self):
+        self.url_builds = 0
+
+    @property
+    def url(self):
+        self.url_builds += 1
+        return "https://example.com/original.jpg"
+
+
+class FakePost:
+    image_field = "featured_image"
+
+    def __init__(self, has_image, image_derivatives):
+        self.has_image = has_image
+        self.image_derivatives = image_derivatives
+        self.featured_image = FakeImage()
+
+
+class TestResponsiveImage(SimpleTestCase):
+
+    def _render(self, post):
+        template = Template(
+            "{% load images %}"
+            '{% responsive_image post "card" "Alt" %}'
+            '{% responsive_image post "card" "Alt" %}'
+        )
+        return template.render(Context({"post": post}))
+
+    def test_placeholder_uses_default_derivatives(self):
+        """Test that a post without an image shows the default image"""
+
+        post = FakePost(False, {})
+        html = self._render(post)
+        self.assertIn("/static/images/default-400w.webp 400w", html)
+        self.assertEqual(post.featured_image.url_builds, 0)
+
+    def test_stored_derivatives_need_no_url_building(self):
+        """Test that stored srcsets are output without building URLs"""
+
+        srcsets = {"avif": "a 400w", "webp": "w 400w", "jpg": "j 400w"}
+        post = FakePost(True, {"card": {**srcsets, "src": "j"}})
+        html = self._render(post)
+        self.assertIn('srcset="w 400w"', html)
+        self.assertEqual(post.featured_image.url_builds, 0)
+
+    def test_original_url_is_built_once(self):
+        """Test that an image without derivatives builds its URL once"""
+
+        post = FakePost(True, {})
+        html = self._render(post)
+        self.assertIn('src="https://example.com/original.jpg"', html)
+        self.assertEqual(post.featured_image.url_builds, 1)
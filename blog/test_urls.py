@@ -0,0 +1,85 @@
+import json
+import subprocess
+import sys
+from django.test import SimpleTestCase
+import django_summernote.urls
+from codestar.urls import summernote_patterns
+
+# Reverses and resolves URLs in a new interpreter, where nothing has run the
+# system checks or loaded the admin yet.
+RESOLVE_SCRIPT = """
+import json
+import sys
+import django
+django.setup()
+from django.urls import resolve, reverse
+names = json.loads(sys.argv[1])
+routes = {}
+for name, args in names:
+    path = reverse(name, args=args)
+    routes[name] = [path, resolve(path).view_name]
+print(json.dumps(routes))
+"""
+
+
+class TestLazyUrls(SimpleTestCase):
+
+    def test_lazy_urls_resolve_in_a_fresh_process(self):
+        """Test that lazily loaded URLs work before anything else loads"""
+
+        names = [
+            ("admin:index", []),
+            ("admin:blog_post_changelist", []),
+            ("admin:blog_comment_change", [1]),
+            ("admin:about_collaboraterequest_changelist", []),
+            ("django_summernote-editor", ["id_content"]),
+            ("django_summernote-upload_attachment", []),
+        ]
+        result = subprocess.run(
+            [sys.executable, "-c", RESOLVE_SCRIPT, json.dumps(names)],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        self.assertEqual(
+            json.loads(result.stdout),
+            {
+                "admin:index": ["/admin/", "admin:index"],
+                "admin:blog_post_changelist": [
+                    "/admin/blog/post/",
+                    "admin:blog_post_changelist",
+                ],
+                "admin:blog_comment_change": [
+                    "/admin/blog/comment/1/change/",
+                    "admin:blog_comment_change",
+                ],
+                "admin:about_collaboraterequest_changelist": [
+                    "/admin/about/collaboraterequest/",
+                    "admin:about_collaboraterequest_changelist",
+                ],
+                "django_summernote-editor": [
+                    "/summernoteeditor/id_content/",
+                    "django_summernote-editor",
+                ],
+                "django_summernote-upload_attachment": [
+                    "/summernoteupload_attachment/",
+                    "django_summernote-upload_attachment",
+                ],
+            },
+        )
+
+    def test_summernote_patterns_match_summernote_urlconf(self):
+        """Test that the copied Summernote URLs match the installed ones"""
+
+        def view_path(view):
+            return f"{view.view_class.__module__}.{view.view_class.__name__}"
+
+        installed = {
+            pattern.name: (str(pattern.pattern), view_path(pattern.callback))
+            for pattern in django_summernote.urls.urlpatterns
+        }
+        copied = {
+            pattern.name: (str(pattern.pattern), pattern.callback.view_path)
+            for pattern in summernote_patterns
+        }
+        self.assertEqual(copied, installed)
@@ -1,9 +1,24 @@
+import importlib
+import os
+import subprocess
+import sys
+from html.parser import HTMLParser
+from unittest import mock
 from http import HTTPStatus
-from django.contrib.auth.models import User
-from django.urls import reverse
-from django.test import TestCase
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import caches
+from django.db import connection
+from django.urls import clear_url_caches, resolve, reverse
+from django.http import Http404
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from codestar.page_cache import build_id
+from . import urls as blog_urls
 from .forms import CommentForm
-from .models import Post, PUBLISHED
+from .models import Comment, Post, PUBLISHED
+from .views import COMMENTS_PER_PAGE, AsyncPostList, async_post_detail
 
 
 class TestBlogViews(TestCase):
@@ -47,3 +62,550 @@ class TestBlogViews(TestCase):
         self.assertIn(
             b"Comment submitted and awaiting approval", response.content
         )
+
+    @override_settings(
+        RATE_LIMIT_ENABLED=True, RATE_LIMITS={"comment": (2, 60)}
+    )
+    def test_comment_flood_is_rejected_before_saving(self):
+        """Test that comments over the rate limit get 429 and aren't saved"""
+
+        caches["ratelimit"].clear()
+        self.addCleanup(caches["ratelimit"].clear)
+        self.client.login(username=self.username, password=self.password)
+        path = reverse("post_detail", args=["blog-slug"])
+        for _ in range(2):
+            response = self.client.post(path, {"body": "Comment body"})
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+        response = self.client.post(path, {"body": "Comment body"})
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response.headers)
+        self.assertEqual(Comment.objects.count(), 2)
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_post_detail_hides_other_users_unapproved_comments(self):
+        """Test that only approved and own pending comments are rendered"""
+
+        other_user = User.objects.create_user(
+            username="otherUser", password="otherPassword"
+        )
+        Comment.objects.create(
+            post=self.post, author=other_user, body="Approved", approved=True
+        )
+        Comment.objects.create(
+            post=self.post, author=other_user, body="Spam", approved=False
+        )
+        Comment.objects.create(
+            post=self.post, author=self.user, body="Pending", approved=False
+        )
+        self.client.login(username=self.username, password=self.password)
+        response = self.client.get(reverse("post_detail", args=["blog-slug"]))
+        bodies = [comment.body for comment in response.context["comments"]]
+        self.assertCountEqual(bodies, ["Approved", "Pending"])
+        self.assertNotIn(b"Spam", response.content)
+
+    def test_comment_page_returns_older_comments(self):
+        """Test that following the cursors returns every comment once"""
+
+        for index in range(COMMENTS_PER_PAGE + 3):
+            Comment.objects.create(
+                post=self.post,
+                author=self.user,
+                body=f"Comment {index}",
+                approved=True,
+            )
+        response = self.client.get(reverse("post_detail", args=["blog-slug"]))
+        self.assertEqual(len(response.context["comments"]), COMMENTS_PER_PAGE)
+        self.assertIn(b"Comment 12", response.content)
+        self.assertNotIn(b"Comment 2<", response.content)
+        cursor = response.context["next_comment_cursor"]
+
+        response = self.client.get(
+            reverse("comment_page", args=["blog-slug"]), {"before": cursor}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        page = response.json()
+        self.assertIsNone(page["next_cursor"])
+        for index in range(3):
+            self.assertIn(f"Comment {index}<", page["html"])
+        self.assertNotIn("Comment 3<", page["html"])
+
+    def test_comment_page_rejects_invalid_cursor(self):
+        """Test that a malformed cursor is a bad request"""
+
+        response = self.client.get(
+            reverse("comment_page", args=["blog-slug"]), {"before": "nope"}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+
+@override_settings(PAGE_CACHE_TIMEOUT=0)
+class TestSessionQueries(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="myUsername", password="myPassword"
+        )
+        Post.objects.create(
+            title="Blog title",
+            author=self.user,
+            slug="blog-slug",
+            status=PUBLISHED,
+        )
+
+    def session_queries(self, request, *args, **kwargs):
+        """Return the session table queries made by a client request."""
+        with CaptureQueriesContext(connection) as queries:
+            response = request(*args, **kwargs)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return [
+            query["sql"]
+            for query in queries.captured_queries
+            if "django_session" in query["sql"]
+        ]
+
+    def test_anonymous_readers_never_touch_session_table(self):
+        """Test that anonymous page views don't read or write sessions"""
+
+        for path in (
+            reverse("home"),
+            reverse("post_detail", args=["blog-slug"]),
+            reverse("api_post_list"),
+        ):
+            self.assertEqual(self.session_queries(self.client.get, path), [])
+        self.assertNotIn("sessionid", self.client.cookies)
+
+    def test_comment_reads_session_from_cache(self):
+        """Test that posting a comment doesn't query the session table"""
+
+        self.client.login(username="myUsername", password="myPassword")
+        queries = self.session_queries(
+            self.client.post,
+            reverse("post_detail", args=["blog-slug"]),
+            {"body": "Comment body"},
+        )
+        self.assertEqual(queries, [])
+
+
+class TestAsyncReadViews(TestCase):
+
+    def setUp(self):
+        caches["pages"].clear()
+        self.user = User.objects.create_user(
+            username="myUsername", password="myPassword"
+        )
+        self.post = Post.objects.create(
+            title="Blog title",
+            author=self.user,
+            slug="blog-slug",
+            content="Blog content",
+            status=PUBLISHED,
+        )
+        Comment.objects.create(
+            post=self.post, author=self.user, body="Approved", approved=True
+        )
+        Comment.objects.create(
+            post=self.post, author=self.user, body="Pending", approved=False
+        )
+
+    def request(self, path, user=None, headers=None):
+        request = AsyncRequestFactory().get(path, headers=headers)
+        request.user = user or AnonymousUser()
+        return request
+
+    async def test_async_post_list_renders_posts(self):
+        """Test that the async post list renders a keyset page"""
+
+        response = await AsyncPostList.as_view()(self.request("/"))
+        response.render()
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn(b"Blog title", response.content)
+        self.assertFalse(response.context_data["page_obj"].has_next())
+
+    @override_settings(POST_LIST_PAGINATION="offset")
+    async def test_async_post_list_supports_offset_pages(self):
+        """Test that offset pages are fetched in a worker thread"""
+
+        response = await AsyncPostList.as_view()(self.request("/"))
+        self.assertEqual(response.context_data["paginator"].count, 1)
+
+    async def test_async_post_detail_renders_approved_comments(self):
+        """Test that anonymous readers see only approved comments"""
+
+        response = await async_post_detail(
+            self.request("/blog-slug/"), slug="blog-slug"
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn(b"Blog content", response.content)
+        self.assertIn(b"Approved", response.content)
+        self.assertNotIn(b"Pending", response.content)
+
+    async def test_async_post_detail_shows_own_pending_comments(self):
+        """Test that signed in users see their comments awaiting approval"""
+
+        response = await async_post_detail(
+            self.request("/blog-slug/", user=self.user), slug="blog-slug"
+        )
+        self.assertIn(b"Pending", response.content)
+
+    def test_async_post_detail_is_cached_and_revalidated(self):
+        """Test the async page cache and conditional GET support"""
+
+        view = async_to_sync(async_post_detail)
+        response = view(self.request("/blog-slug/"), slug="blog-slug")
+        with self.assertNumQueries(0):
+            cached = view(self.request("/blog-slug/"), slug="blog-slug")
+        self.assertEqual(cached.content, response.content)
+        etag = response["ETag"]
+        response = view(
+            self.request("/blog-slug/", headers={"If-None-Match": etag}),
+            slug="blog-slug",
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    async def test_async_post_detail_raises_404_for_unknown_post(self):
+        with self.assertRaises(Http404):
+            await async_post_detail(self.request("/nope/"), slug="nope")
+
+    def test_asgi_application_closes_connections_after_requests(self):
+        """Test that ASGI workers don't keep connections they can't reuse"""
+
+        script = (
+            "import codestar.asgi; from django.conf import settings; "
+            "print(settings.DATABASES['default']['CONN_MAX_AGE'])"
+        )
+        env = {
+            name: value
+            for name, value in os.environ.items()
+            if name != "DATABASE_CONN_MAX_AGE"
+        }
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            check=True,
+            env=env,
+            text=True,
+        )
+        self.assertEqual(result.stdout.strip(), "0")
+
+    def test_urls_route_to_async_views_when_enabled(self):
+        """Test that ASYNC_READ_VIEWS switches the blog URLs to async views"""
+
+        def reload_urls():
+            importlib.reload(blog_urls)
+            importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+            clear_url_caches()
+
+        self.addCleanup(reload_urls)
+        with override_settings(ASYNC_READ_VIEWS=True):
+            reload_urls()
+            self.assertIs(resolve("/").func.view_class, AsyncPostList)
+            self.assertIs(resolve("/blog-slug/").func, async_post_detail)
+            response = self.client.get(reverse("home"))
+            self.assertContains(response, "Blog title")
+            response = self.client.get(
+                reverse("post_detail", args=["blog-slug"])
+            )
+            self.assertContains(response, "Approved")
+            self.assertNotContains(response, "Pending")
+
+
+@override_settings(PAGE_CACHE_TIMEOUT=0)
+class TestBlogQueryCounts(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="commenter", password="myPassword"
+        )
+        self.post = Post.objects.create(
+            title="Blog title",
+            author=self.user,
+            slug="blog-slug",
+            excerpt="Blog excerpt",
+            content="Blog content",
+            status=PUBLISHED,
+        )
+
+    def _add_comments(self, count):
+        Comment.objects.bulk_create(
+            Comment(
+                post=self.post, author=self.user, body="Body", approved=True
+            )
+            for _ in range(count)
+        )
+
+    def _add_posts(self, count):
+        Post.objects.bulk_create(
+            Post(
+                title=f"Post {index}",
+                author=self.user,
+                slug=f"post-{index}",
+                content="Content",
+                status=PUBLISHED,
+            )
+            for index in range(count)
+        )
+
+    def test_post_detail_query_count_is_fixed(self):
+        """Test that the number of comments doesn't add queries"""
+
+        url = reverse("post_detail", args=["blog-slug"])
+        for comment_count in (5, 5000):
+            with self.subTest(comment_count=comment_count):
+                Comment.objects.all().delete()
+                self._add_comments(comment_count)
+                # The post and its validators, then the page of comments.
+                with self.assertNumQueries(3):
+                    self.client.get(url)
+
+    def test_post_list_query_count_is_fixed(self):
+        """Test that the number of posts on a page doesn't add queries"""
+
+        for post_count in (1, 5):
+            with self.subTest(post_count=post_count):
+                Post.objects.exclude(pk=self.post.pk).delete()
+                self._add_posts(post_count)
+                with self.assertNumQueries(1):
+                    self.client.get(reverse("home"))
+
+
+class TestPostListPagination(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="author", password="myPassword"
+        )
+        for index in range(14):
+            Post.objects.create(
+                title=f"Post {index}",
+                author=self.user,
+                slug=f"post-{index}",
+                content="Content",
+                status=PUBLISHED,
+            )
+
+    def _titles(self, response):
+        return [post.title for post in response.context["post_list"]]
+
+    def test_keyset_pages_walk_forwards_and_backwards(self):
+        """Test that NEXT and PREV cursors visit every post in order"""
+
+        first = self.client.get(reverse("home"))
+        self.assertEqual(len(self._titles(first)), 6)
+        self.assertFalse(first.context["page_obj"].has_previous())
+        second = self.client.get(
+            reverse("home"),
+            {"before": first.context["page_obj"].next_cursor},
+        )
+        third = self.client.get(
+            reverse("home"),
+            {"before": second.context["page_obj"].next_cursor},
+        )
+        self.assertEqual(len(self._titles(third)), 2)
+        self.assertFalse(third.context["page_obj"].has_next())
+        titles = self._titles(first) + self._titles(second)
+        titles += self._titles(third)
+        expected = [f"Post {index}" for index in reversed(range(14))]
+        self.assertEqual(titles, expected)
+
+        back = self.client.get(
+            reverse("home"),
+            {"after": second.context["page_obj"].previous_cursor},
+        )
+        self.assertEqual(self._titles(back), self._titles(first))
+        self.assertFalse(back.context["page_obj"].has_previous())
+        self.assertIn(b"?before=", back.content)
+
+    @override_settings(POST_LIST_PAGINATION="offset")
+    def test_offset_pagination_mode(self):
+        """Test that numbered pages still work when configured"""
+
+        response = self.client.get(reverse("home"), {"page": 3})
+        self.assertEqual(self._titles(response), ["Post 1", "Post 0"])
+        self.assertIn(b"?page=2", response.content)
+
+
+class TestPageCache(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="author", password="myPassword"
+        )
+        self.post = Post.objects.create(
+            title="Blog title",
+            author=self.user,
+            slug="blog-slug",
+            content="Blog content",
+            status=PUBLISHED,
+        )
+        self.url = reverse("post_detail", args=["blog-slug"])
+
+    def test_anonymous_repeat_visit_is_served_from_cache(self):
+        """Test that a repeat visit doesn't touch the database"""
+
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertIn(b"Blog content", response.content)
+
+    def test_saving_content_invalidates_cached_pages(self):
+        """Test that saving a post makes cached pages stale"""
+
+        self.client.get(self.url)
+        self.client.get(reverse("home"))
+        self.post.title = "New title"
+        self.post.save()
+        self.assertIn(b"New title", self.client.get(self.url).content)
+        self.assertIn(b"New title", self.client.get(reverse("home")).content)
+
+    def test_authenticated_users_bypass_cache(self):
+        """Test that logged in users always get a freshly rendered page"""
+
+        self.client.get(self.url)
+        self.client.login(username="author", password="myPassword")
+        response = self.client.get(self.url)
+        self.assertIn(b"You are logged in as author", response.content)
+
+    def test_unchanged_post_is_not_modified(self):
+        """Test that revalidating an unchanged post returns 304"""
+
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        Comment.objects.create(
+            post=self.post, author=self.user, body="Body", approved=True
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_deploy_makes_pages_stale(self):
+        """Test that pages from an earlier build are neither 304 nor cached"""
+
+        self.addCleanup(build_id.cache_clear)
+        build_id.cache_clear()
+        with mock.patch.dict(os.environ, {"HEROKU_SLUG_COMMIT": "old"}):
+            etag = self.client.get(self.url)["ETag"]
+        build_id.cache_clear()
+        with mock.patch.dict(os.environ, {"HEROKU_SLUG_COMMIT": "new"}):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_approving_an_older_comment_modifies_post(self):
+        """Test that approving an older comment isn't hidden by a 304"""
+
+        comment = Comment.objects.create(
+            post=self.post, author=self.user, body="Older", approved=False
+        )
+        Comment.objects.create(
+            post=self.post, author=self.user, body="Newer", approved=True
+        )
+        response = self.client.get(self.url)
+        # A timestamp can't track approvals, so only the ETag validates.
+        self.assertNotIn("Last-Modified", response.headers)
+        etag = response["ETag"]
+        comment.approved = True
+        comment.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn(b"Older", response.content)
+
+    def test_pages_with_messages_bypass_cache(self):
+        """Test that a pending flash message is never hidden by the cache"""
+
+        self.client.get(self.url)
+        self.client.cookies["messages"] = "pending"
+        response = self.client.get(self.url)
+        self.assertIsNotNone(response.context)
+
+
+class TestPostSearch(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="author", password="myPassword"
+        )
+        posts = (
+            ("Django tips", "All about templates.", PUBLISHED),
+            ("Gardening", "Django reinhardt played guitar.", PUBLISHED),
+            ("Draft on Django", "Unfinished.", 0),
+        )
+        for index, (title, content, status) in enumerate(posts):
+            Post.objects.create(
+                title=title,
+                author=self.user,
+                slug=f"post-{index}",
+                content=content,
+                status=status,
+            )
+
+    def _search(self, query):
+        response = self.client.get(reverse("post_search"), {"q": query})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return [post.title for post in response.context["post_list"]]
+
+    def test_results_are_ranked_and_published_only(self):
+        """Test that title matches rank first and drafts are excluded"""
+
+        self.assertEqual(self._search("django"), ["Django tips", "Gardening"])
+
+    def test_index_follows_saves_and_deletes(self):
+        """Test that edited and deleted posts are reindexed"""
+
+        post = Post.objects.get(title="Gardening")
+        post.content = "Roses and tulips."
+        post.save()
+        self.assertEqual(self._search("tulips"), ["Gardening"])
+        self.assertEqual(self._search("reinhardt"), [])
+        post.delete()
+        self.assertEqual(self._search("tulips"), [])
+
+    def test_query_syntax_is_treated_as_words(self):
+        """Test that search operators typed by readers don't cause errors"""
+
+        self.assertEqual(self._search('"django" AND ('), [])
+        self.assertEqual(self._search("-"), [])
+
+    def test_markup_is_not_searched(self):
+        """Test that tag and attribute names in the HTML don't match"""
+
+        post = Post.objects.get(title="Gardening")
+        post.content = '<p><span class="lead">Tulips</span> &amp; roses</p>'
+        post.save()
+        self.assertEqual(self._search("span lead class"), [])
+        self.assertEqual(self._search("tulips roses"), ["Gardening"])
+        self.assertEqual(self._search("amp"), [])
+
+
+class _ResourceParser(HTMLParser):
+    """Collects the URLs of a page's stylesheets, fonts and scripts."""
+
+    def __init__(self):
+        super().__init__()
+        self.urls = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "link" and "href" in attrs:
+            self.urls.append(attrs["href"])
+        elif tag == "script" and "src" in attrs:
+            self.urls.append(attrs["src"])
+
+
+class TestBaseTemplate(TestCase):
+
+    def test_pages_load_no_third_party_resources(self):
+        """Test that no stylesheet, font or script comes from another host"""
+
+        for path in (reverse("home"), reverse("about-path")):
+            parser = _ResourceParser()
+            parser.feed(self.client.get(path).content.decode())
+            self.assertTrue(parser.urls)
+            external = [
+                url
+                for url in parser.urls
+                if url.startswith(("http:", "https:", "//"))
+            ]
+            self.assertEqual(external, [], path)
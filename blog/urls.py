@@ -1,9 +1,27 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, views
+
+# ASGI workers serve the post list and post details with async views.
+if settings.ASYNC_READ_VIEWS:
+    post_list = views.AsyncPostList.as_view()
+    post_detail = views.async_post_detail
+else:
+    post_list = views.PostList.as_view()
+    post_detail = views.post_detail
 
 urlpatterns = [
-    path("", views.PostList.as_view(), name="home"),
-    path("<slug:slug>/", views.post_detail, name="post_detail"),
+    path("", post_list, name="home"),
+    path("search/", views.PostSearch.as_view(), name="post_search"),
+    path("api/posts/", api.post_list, name="api_post_list"),
+    path("api/posts/<slug:slug>/", api.post_detail, name="api_post_detail"),
+    path(
+        "api/posts/<slug:slug>/comments/",
+        api.comment_list,
+        name="api_comment_list",
+    ),
+    path("<slug:slug>/", post_detail, name="post_detail"),
+    path("<slug:slug>/comments/", views.comment_page, name="comment_page"),
     path(
         "<slug:slug>/edit_comment/<int:comment_id>",
         views.comment_edit,
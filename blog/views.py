@@ -1,15 +1,31 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
-from django.http import HttpResponseRedirect
+from django.db.models import Max, Q
+from django.http import Http404, HttpResponseRedirect, JsonResponse
 from django.shortcuts import get_object_or_404, render, reverse
+from django.template.loader import render_to_string
+from django.utils.decorators import method_decorator
 from django.views import generic
+from codestar.conditional import conditional_page
+from codestar.page_cache import auser, cache_anonymous_page
+from codestar.ratelimit import rate_limit
 from .forms import CommentForm
-from .models import Comment, Post, PUBLISHED
+from .models import Comment, Post
+from .pagination import akeyset_page, keyset_page
+from .search import search_posts
 
+# The number of comments rendered with a post and fetched per "load more".
+COMMENTS_PER_PAGE = 10
 
+
+@method_decorator(cache_anonymous_page, name="dispatch")
 class PostList(generic.ListView):
     """
     A list view for blog posts.
 
+    Anonymous readers are served from the page cache.
+
     Models:
         :model:`blog.Post`
 
@@ -17,20 +33,176 @@ class PostList(generic.ListView):
         :template:`blog/index.html`
 
     Context:
-        posts (QuerySet): All published posts.
+        posts (QuerySet):
+            All published posts, fetched with their authors and only the
+            columns the post cards use.
+        page_obj (Page or KeysetPage):
+            The current page. It's a :class:`blog.pagination.KeysetPage` when
+            keyset pagination is used.
     """
 
-    queryset = Post.objects.filter(status=PUBLISHED)
+    queryset = Post.objects.for_list()
     template_name = "blog/index.html"
     paginate_by = 6
+    # "keyset" or "offset". Defaults to `settings.POST_LIST_PAGINATION`.
+    pagination = None
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Paginate with keyset cursors unless offset pagination is configured.
+
+        Keyset pages are selected with the `before` and `after` query
+        parameters and never run a COUNT query.
+        """
+        pagination = self.pagination or settings.POST_LIST_PAGINATION
+        if pagination != "keyset":
+            return super().paginate_queryset(queryset, page_size)
+        page = keyset_page(
+            queryset,
+            page_size,
+            before=self.request.GET.get("before"),
+            after=self.request.GET.get("after"),
+        )
+        return (None, page, page.object_list, page.has_other_pages())
+
+
+@method_decorator(cache_anonymous_page, name="dispatch")
+class AsyncPostList(PostList):
+    """
+    An async version of :view:`blog.views.PostList` for ASGI workers.
+
+    Keyset pages are fetched with the async ORM, so the worker serves other
+    requests while it waits for the database. Offset pages are fetched in a
+    worker thread.
+    """
+
+    # The keyset page fetched by `get`, or None for offset pagination.
+    keyset = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        # Skip PostList's sync page cache; this class has an async one.
+        return await generic.ListView.dispatch(self, request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        pagination = self.pagination or settings.POST_LIST_PAGINATION
+        if pagination != "keyset":
+            return await sync_to_async(super().get)(request, *args, **kwargs)
+        self.object_list = self.get_queryset()
+        self.keyset = await akeyset_page(
+            self.object_list,
+            self.get_paginate_by(self.object_list),
+            before=request.GET.get("before"),
+            after=request.GET.get("after"),
+        )
+        return self.render_to_response(self.get_context_data())
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.keyset is None:
+            return super().paginate_queryset(queryset, page_size)
+        page = self.keyset
+        return (None, page, page.object_list, page.has_other_pages())
+
+
+class PostSearch(generic.ListView):
+    """
+    A list view for published blog posts that match a search.
+
+    Models:
+        :model:`blog.Post`
+
+    Template:
+        :template:`blog/search.html`
+
+    Context:
+        post_list (QuerySet):
+            The published posts that match the `q` query parameter, best
+            matches first.
+        query (str): The search terms.
+    """
+
+    template_name = "blog/search.html"
+    paginate_by = 6
+
+    def get_queryset(self):
+        self.query = self.request.GET.get("q", "").strip()
+        if not self.query:
+            return Post.objects.none()
+        return search_posts(Post.objects.for_list(), self.query)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["query"] = self.query
+        return context
+
+
+def _post_versions(slug):
+    """
+    Return a query for the values that identify the version of a post.
+    """
+    return (
+        Post.objects.published()
+        .filter(slug=slug)
+        .annotate(
+            latest_comment_on=Max(
+                "comments__created_on", filter=Q(comments__approved=True)
+            )
+        )
+        .values("updated_on", "approved_comment_count", "latest_comment_on")
+    )
+
+
+def _validators(post):
+    if post is None:
+        return None
+    # No Last-Modified: approving an older comment or deleting one changes
+    # the page without a later timestamp, so only the ETag is reliable.
+    return tuple(post.values()), None
+
+
+def _post_validators(request, slug):
+    """
+    Return the values that identify the version of a post details page.
+
+    The post's `updated_on`, approved comment count and newest approved
+    comment are found in one query.
 
+    Args:
+        request (HttpRequest): The request for the post details page.
+        slug (str): Contains the ID of a :model:`blog.Post`.
+
+    Models:
+        :model:`blog.Post`
+        :model:`blog.Comment`
+
+    Returns:
+        tuple:
+            The version values and None for the last modified datetime, or
+            None if there is no published post with this slug.
+    """
+    return _validators(_post_versions(slug).first())
+
+
+async def _apost_validators(request, slug):
+    """
+    An async version of :func:`_post_validators`.
+    """
+    return _validators(await _post_versions(slug).afirst())
 
+
+@rate_limit("comment")
+@cache_anonymous_page
+@conditional_page(_post_validators)
 def post_detail(request, slug):
     """
     Return the post details page for a post and save a new comment.
 
     If `request`'s method is POST, the user is trying to create a new comment,
     so save the comment to the database before returning the post details page.
+    Each user's comments are rate limited, and over the limit a 429 response
+    is returned without touching the post or the form.
+    Anonymous readers are served from the page cache, and their conditional
+    requests are answered with 304 when the post and its comments haven't
+    changed.
 
     Args:
         request (HttpRequest):
@@ -47,7 +219,12 @@ def post_detail(request, slug):
 
     Context:
         post (:model:`blog.Post`): The blog post.
-        comments (QuerySet): All :model:`blog.Comment` instances for the post.
+        comments (list):
+            The newest page of the post's approved :model:`blog.Comment`
+            instances plus the user's own comments awaiting approval.
+        next_comment_cursor (str):
+            The cursor for the next page of older comments, or None if there
+            are no older comments.
         comment_count (int): The number of approved comments for the post.
         comment_form (:form:`blog.CommentForm`): An empty form.
 
@@ -60,21 +237,139 @@ def post_detail(request, slug):
             the new comment to the database.
 
     Returns:
-        HttpResponse: Contains the blog details page for the post.
+        HttpResponse:
+            Contains the blog details page for the post, or a 429 response if
+            the user has posted too many comments.
     """
-    published_posts = Post.objects.filter(status=PUBLISHED)
-    post = get_object_or_404(published_posts, slug=slug)
+    post = get_object_or_404(_detail_posts(), slug=slug)
     if request.method == "POST":
         _save_comment(request, post)
+    comments = _comment_page(request, post, None)
+    return _render_post_detail(request, post, comments)
+
+
+@cache_anonymous_page
+@conditional_page(_apost_validators)
+async def async_post_detail(request, slug):
+    """
+    An async version of :view:`blog.views.post_detail` for ASGI workers.
+
+    The post and its comments are read with the async ORM, so the worker
+    serves other requests while it waits for the database. New comments are
+    saved by :view:`blog.views.post_detail` in a worker thread.
+
+    Args:
+        request (HttpRequest):
+            A GET or POST request. If it's a POST request, it contains
+            :form:`blog.CommentForm` data for a new comment.
+        slug (str): Contains the ID of a :model:`blog.Post`.
+
+    Models:
+        :model:`blog.Post`
+        :model:`blog.Comment`
+
+    Template:
+        :template:`blog/post_detail.html`
+
+    Returns:
+        HttpResponse: As returned by :view:`blog.views.post_detail`.
+    """
+    if request.method == "POST":
+        return await sync_to_async(post_detail)(request, slug)
+    user = await auser(request)
+    try:
+        post = await _detail_posts().aget(slug=slug)
+    except Post.DoesNotExist:
+        raise Http404("No Post matches the given query.")
+    comments = await akeyset_page(
+        post.comments.visible_to(user).for_thread(), COMMENTS_PER_PAGE
+    )
+    return _render_post_detail(request, post, comments)
+
+
+def _detail_posts():
+    """Return published posts with the columns the post details page uses."""
+    return Post.objects.published().with_author().defer("content")
+
+
+def _render_post_detail(request, post, comments):
+    """
+    Render the post details page.
+
+    Args:
+        request (HttpRequest): The request for the page.
+        post (:model:`blog.Post`): The blog post.
+        comments (KeysetPage): The newest page of comments the user may see.
+
+    Returns:
+        HttpResponse: The post details page.
+    """
     context = {
         "post": post,
-        "comments": post.comments.all().order_by("-created_on"),
-        "comment_count": post.comments.filter(approved=True).count(),
+        "comments": comments.object_list,
+        "next_comment_cursor": comments.next_cursor,
+        "comment_count": post.approved_comment_count,
         "comment_form": CommentForm(),
     }
     return render(request, "blog/post_detail.html", context)
 
 
+def comment_page(request, slug):
+    """
+    Return a page of older comments for a post as an HTML fragment.
+
+    Used by `static/js/comments.js` to load older comments on demand.
+
+    Args:
+        request (HttpRequest):
+            A GET request. Its `before` query parameter is the cursor of the
+            last comment the user has already seen.
+        slug (str): Contains the ID of a :model:`blog.Post`.
+
+    Models:
+        :model:`blog.Post`
+        :model:`blog.Comment`
+
+    Template:
+        :template:`blog/comments.html`
+
+    Returns:
+        JsonResponse:
+            Contains `html`, the rendered comments, and `next_cursor`, the
+            cursor for the following page or null if there are no more
+            comments.
+    """
+    post = get_object_or_404(Post.objects.published(), slug=slug)
+    comments = _comment_page(request, post, request.GET.get("before"))
+    html = render_to_string(
+        "blog/comments.html",
+        {"comments": comments.object_list},
+        request=request,
+    )
+    return JsonResponse({"html": html, "next_cursor": comments.next_cursor})
+
+
+def _comment_page(request, post, cursor):
+    """
+    Return a page of the comments on `post` that the user may see.
+
+    Args:
+        request (HttpRequest): The request whose user is viewing the comments.
+        post (:model:`blog.Post`): The comments' related post.
+        cursor (str):
+            The cursor of the last comment on the previous page, or None for
+            the newest comments.
+
+    Models:
+        :model:`blog.Comment`
+
+    Returns:
+        KeysetPage: The page of comments.
+    """
+    comments = post.comments.visible_to(request.user).for_thread()
+    return keyset_page(comments, COMMENTS_PER_PAGE, before=cursor)
+
+
 def _save_comment(request, post):
     """
     Save a new comment to the database.
@@ -0,0 +1,12 @@
+"""
+The admin site's URLconf.
+
+It's imported when an admin URL is first used, so the installed apps' admin
+modules are discovered then instead of when Django starts.
+"""
+
+from django.contrib import admin
+
+admin.autodiscover()
+
+urlpatterns = admin.site.get_urls()
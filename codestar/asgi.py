@@ -3,6 +3,11 @@ ASGI config for codestar project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The post list and post details are served by async views. To serve the site
+with uvicorn workers, run:
+
+    GUNICORN_INTERFACE=asgi gunicorn --config python:codestar.gunicorn_config
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
@@ -12,5 +17,10 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'codestar.settings')
+os.environ.setdefault('ASYNC_READ_VIEWS', 'True')
+# Each request runs its queries in a new thread, so a persistent connection
+# is never reused and is left open until garbage collection. Close it at the
+# end of each request instead.
+os.environ.setdefault('DATABASE_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
@@ -0,0 +1,119 @@
+"""
+Conditional GET support for pages read by anonymous visitors.
+
+Views describe their content's freshness with a cheap validator function, and
+matching If-None-Match or If-Modified-Since requests are answered with 304
+before the view or its templates run.
+"""
+
+import hashlib
+from functools import wraps
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition
+from .page_cache import auser, build_id, has_pending_messages
+
+
+def _is_validated(request):
+    """
+    Return True if the page for `request` depends only on the validated
+    content.
+    """
+    return (
+        request.method in ("GET", "HEAD")
+        and not request.user.is_authenticated
+        and not has_pending_messages(request)
+    )
+
+
+def _etag(request, found):
+    if found is None:
+        return None
+    version, _ = found
+    csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME, "")
+    parts = (*version, csrf_cookie, build_id())
+    raw = "|".join(str(part) for part in parts)
+    return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def conditional_page(validators):
+    """
+    Return a decorator that answers conditional GETs from `validators`.
+
+    Logged in users and requests carrying flash messages always get the full
+    page, because the page then depends on more than the validated content.
+    The CSRF cookie is folded into the ETag so that a revalidated page never
+    carries a CSRF token for a cookie the visitor no longer has, and so is the
+    build ID, so that a page from before a deploy never links to static files
+    the deploy removed.
+
+    Args:
+        validators (callable):
+            Called with the view's arguments. Returns None if the content
+            doesn't exist, or a tuple of the values that identify the
+            content's version and the content's last modified datetime,
+            or None if the content can change without a later datetime.
+            If it's a coroutine function, the decorator is for async views.
+
+    Returns:
+        callable: A view decorator.
+    """
+    if iscoroutinefunction(validators):
+        return _async_conditional_page(validators)
+
+    def lookup(request, *args, **kwargs):
+        if not hasattr(request, "_page_validators"):
+            request._page_validators = None
+            if _is_validated(request):
+                request._page_validators = validators(request, *args, **kwargs)
+        return request._page_validators
+
+    def etag(request, *args, **kwargs):
+        return _etag(request, lookup(request, *args, **kwargs))
+
+    def last_modified(request, *args, **kwargs):
+        found = lookup(request, *args, **kwargs)
+        return None if found is None else found[1]
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
+
+
+def _async_conditional_page(validators):
+    """
+    The async version of :func:`conditional_page`, for async views.
+
+    It answers conditional requests like Django's `condition` decorator,
+    which only supports sync views before Django 5.0.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            await auser(request)
+            found = None
+            if _is_validated(request):
+                found = await validators(request, *args, **kwargs)
+            etag = last_modified = None
+            if found is not None:
+                etag = quote_etag(_etag(request, found))
+                if found[1] is not None:
+                    last_modified = int(found[1].timestamp())
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if request.method in ("GET", "HEAD"):
+                if last_modified and not response.has_header("Last-Modified"):
+                    response.headers["Last-Modified"] = http_date(
+                        last_modified
+                    )
+                if etag:
+                    response.headers.setdefault("ETag", etag)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,85 @@
+"""
+Gunicorn config for codestar project.
+
+Run the site with:
+
+    gunicorn --config python:codestar.gunicorn_config
+
+The app is loaded once in the arbiter and the workers are forked from it, so
+they share its memory copy-on-write. Workers are recycled after a number of
+requests to bound memory growth. Set GUNICORN_INTERFACE to "asgi" to serve
+the ASGI application with uvicorn workers.
+
+For the full list of settings and their values, see
+https://docs.gunicorn.org/en/23.0.0/settings.html
+"""
+
+import gc
+import os
+
+
+def _cpu_count():
+    """Return the number of CPUs this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+CPUS = _cpu_count()
+INTERFACE = os.environ.get("GUNICORN_INTERFACE", "wsgi")
+
+# Templates compiled in the arbiter, so that workers share them.
+PRELOAD_TEMPLATES = (
+    "blog/index.html",
+    "blog/post_detail.html",
+    "about/about.html",
+)
+
+if INTERFACE == "asgi":
+    wsgi_app = "codestar.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+    # Each worker serves many connections at once, so one per CPU is enough.
+    default_workers = CPUS
+else:
+    wsgi_app = "codestar.wsgi"
+    worker_class = "gthread"
+    # Requests spend much of their time waiting on the database, so run more
+    # workers than CPUs.
+    default_workers = CPUS * 2 + 1
+
+# Heroku sets WEB_CONCURRENCY to suit the dyno's memory.
+workers = int(os.environ.get("WEB_CONCURRENCY", default_workers))
+# Each thread keeps its own persistent database connection.
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+preload_app = True
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+# Spread the restarts so workers don't all restart at once.
+max_requests_jitter = max_requests // 10
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+# Heartbeat files on a RAM disk never block on a slow disk.
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+
+def when_ready(server):
+    """
+    Finish loading the app in the arbiter before the workers are forked.
+
+    The URLconf, and with it every view, and the main templates are loaded
+    here once instead of in each worker. Database connections are closed so
+    that no worker inherits one, and the loaded objects are moved out of the
+    garbage collector's reach so that collections in the workers don't copy
+    the pages holding them.
+    """
+    if not server.cfg.preload_app:
+        return
+    from django.db import connections
+    from django.template.loader import get_template
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns
+    for name in PRELOAD_TEMPLATES:
+        get_template(name)
+    connections.close_all()
+    gc.freeze()
@@ -0,0 +1,277 @@
+"""
+Responsive image derivatives for post and About images.
+
+When an image is uploaded, resized copies are made for each variant in
+`VARIANTS`, in each of `FORMATS`. Their `srcset` strings are worked out at the
+same time and stored with the model, so templates only output stored strings.
+
+The Cloudinary backend asks Cloudinary to make the derivatives eagerly. The
+local backend makes them with Pillow under `MEDIA_ROOT`, so the pipeline can
+be built and tested without Cloudinary. `settings.IMAGE_BACKEND` picks one.
+"""
+
+import logging
+import os
+from functools import lru_cache
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# The widths in pixels made for each place an image is shown.
+VARIANTS = {
+    "card": (400, 800),
+    "masthead": (800, 1600),
+    "profile": (300, 600),
+}
+# Modern formats first. The last format is the fallback for old browsers.
+FORMATS = ("avif", "webp", "jpg")
+# Static images shown when no image has been uploaded, and their variants.
+DEFAULT_IMAGES = {
+    "images/default.jpg": ("card", "masthead"),
+    "images/nobody.jpg": ("profile",),
+}
+
+
+def public_id_of(image):
+    """
+    Return the Cloudinary public ID of an image field's value.
+
+    Args:
+        image: A `CloudinaryField` value, which may be a plain string.
+
+    Returns:
+        str: The public ID, or "" if there is no image.
+    """
+    return getattr(image, "public_id", image) or ""
+
+
+def is_placeholder(public_id):
+    """Return True if `public_id` means that no image has been uploaded."""
+    return not public_id or "placeholder" in public_id
+
+
+def derivative_name(name, width, image_format):
+    """
+    Return the file name of one derivative of `name`.
+
+    Args:
+        name (str): A public ID or a static file path.
+        width (int): The derivative's width in pixels.
+        image_format (str): The derivative's file extension.
+
+    Returns:
+        str: `name` without its extension, suffixed with width and format.
+    """
+    stem = os.path.splitext(name)[0]
+    return f"{stem}-{width}w.{image_format}"
+
+
+def _widths(variants):
+    """Return the distinct widths needed by `variants`, smallest first."""
+    return sorted({width for name in variants for width in VARIANTS[name]})
+
+
+def _resize(source, target_dir, widths):
+    """
+    Write resized copies of the image file `source` in every format.
+
+    Args:
+        source (str): The original image file's path.
+        target_dir (str): The directory to write the copies to.
+        widths (iterable): The widths to make, in pixels.
+    """
+    from PIL import Image
+
+    name = os.path.basename(source)
+    os.makedirs(target_dir, exist_ok=True)
+    with Image.open(source) as original:
+        original = original.convert("RGB")
+        for width in widths:
+            copy = original.copy()
+            copy.thumbnail((width, width * 10))
+            for image_format in FORMATS:
+                target = derivative_name(name, width, image_format)
+                path = os.path.join(target_dir, target)
+                pillow_format = "JPEG" if image_format == "jpg" else None
+                copy.save(path, pillow_format, quality=80, optimize=True)
+
+
+class CloudinaryImageBackend:
+    """
+    Derivatives made and served by Cloudinary.
+    """
+
+    def _options(self, width, image_format):
+        return {
+            "width": width,
+            "crop": "limit",
+            "quality": "auto",
+            "format": image_format,
+        }
+
+    def url(self, public_id, width, image_format):
+        import cloudinary
+
+        image = cloudinary.CloudinaryImage(public_id)
+        return image.build_url(
+            secure=True, **self._options(width, image_format)
+        )
+
+    def generate(self, public_id, widths):
+        import cloudinary.uploader
+
+        cloudinary.uploader.explicit(
+            public_id,
+            type="upload",
+            eager=[
+                self._options(width, image_format)
+                for width in sorted(set(widths))
+                for image_format in FORMATS
+            ],
+        )
+
+
+class LocalImageBackend:
+    """
+    Derivatives made with Pillow from originals stored under `MEDIA_ROOT`.
+
+    An image's public ID is its path relative to `MEDIA_ROOT`.
+    """
+
+    def url(self, public_id, width, image_format):
+        name = derivative_name(public_id, width, image_format)
+        return f"{settings.MEDIA_URL}derivatives/{name}"
+
+    def generate(self, public_id, widths):
+        target_dir = os.path.join(
+            settings.MEDIA_ROOT, "derivatives", os.path.dirname(public_id)
+        )
+        source = os.path.join(settings.MEDIA_ROOT, public_id)
+        _resize(source, target_dir, widths)
+
+
+def get_backend():
+    """Return an instance of the backend in `settings.IMAGE_BACKEND`."""
+    return import_string(settings.IMAGE_BACKEND)()
+
+
+def _srcsets(url, variants):
+    """
+    Return the `srcset` strings for `variants` in every format.
+
+    Args:
+        url (callable): Returns a derivative's URL from a width and a format.
+        variants (iterable): The names of the variants in `VARIANTS`.
+
+    Returns:
+        dict: Maps each variant to a dict that maps formats to `srcset`
+        strings, plus `src`, the URL of the largest fallback derivative.
+    """
+    result = {}
+    for variant in variants:
+        widths = VARIANTS[variant]
+        srcsets = {
+            image_format: ", ".join(
+                f"{url(width, image_format)} {width}w" for width in widths
+            )
+            for image_format in FORMATS
+        }
+        srcsets["src"] = url(widths[-1], FORMATS[-1])
+        result[variant] = srcsets
+    return result
+
+
+def refresh_derivatives(instance, variants):
+    """
+    Rebuild a saved model instance's derivatives if its image has changed.
+
+    The instance's `image_field` attribute names its `CloudinaryField`. Its
+    `has_image` and `image_derivatives` fields are stored with a separate
+    UPDATE, because a newly uploaded image only gets its public ID while the
+    instance is being saved.
+
+    Args:
+        instance (Model): The saved instance.
+        variants (iterable): The names of the variants in `VARIANTS`.
+    """
+    public_id = public_id_of(getattr(instance, instance.image_field))
+    has_image = not is_placeholder(public_id)
+    current_id = public_id if has_image else ""
+    stored_id = instance.image_derivatives.get("public_id", "")
+    if has_image == instance.has_image and current_id == stored_id:
+        return
+    instance.has_image = has_image
+    instance.image_derivatives = build_derivatives(public_id, variants)
+    type(instance)._base_manager.filter(pk=instance.pk).update(
+        has_image=instance.has_image,
+        image_derivatives=instance.image_derivatives,
+    )
+
+
+def build_derivatives(image, variants):
+    """
+    Make the derivatives of an uploaded image and return their URLs.
+
+    Args:
+        image: A `CloudinaryField` value.
+        variants (iterable): The names of the variants in `VARIANTS`.
+
+    Returns:
+        dict: The image's public ID under `public_id`, plus the `srcset`
+        strings described by :func:`_srcsets`. Empty if there is no image,
+        or if the derivatives couldn't be made, in which case the original
+        image is shown and the next save tries again.
+    """
+    public_id = public_id_of(image)
+    if is_placeholder(public_id):
+        return {}
+    backend = get_backend()
+    try:
+        backend.generate(public_id, _widths(variants))
+    except Exception:
+        # The instance is already saved, so a failure mustn't reach the
+        # code that saved it.
+        logger.exception("Couldn't make the derivatives of %s.", public_id)
+        return {}
+    derivatives = _srcsets(
+        lambda width, image_format: backend.url(
+            public_id, width, image_format
+        ),
+        variants,
+    )
+    derivatives["public_id"] = public_id
+    return derivatives
+
+
+@lru_cache(maxsize=None)
+def default_derivatives(static_path):
+    """
+    Return the `srcset` strings of a static default image.
+
+    Args:
+        static_path (str): A key of `DEFAULT_IMAGES`.
+
+    Returns:
+        dict: As described by :func:`_srcsets`.
+    """
+    from django.templatetags.static import static
+
+    return _srcsets(
+        lambda width, image_format: static(
+            derivative_name(static_path, width, image_format)
+        ),
+        DEFAULT_IMAGES[static_path],
+    )
+
+
+def build_default_derivatives(static_dir):
+    """
+    Write the derivatives of every image in `DEFAULT_IMAGES`.
+
+    Args:
+        static_dir (str): The static files directory holding the images.
+    """
+    for static_path, variants in DEFAULT_IMAGES.items():
+        source = os.path.join(static_dir, static_path)
+        _resize(source, os.path.dirname(source), _widths(variants))
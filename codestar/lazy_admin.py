@@ -0,0 +1,93 @@
+"""
+Load the admin and the Summernote editor when they're first used.
+
+Readers never use either, so workers serving public pages never import the
+apps' admin modules, Summernote's views and forms, or Pillow, which those
+forms import. The admin modules are discovered when an admin URL is first
+resolved or reversed, and when the system checks run.
+"""
+
+from django.contrib.admin import autodiscover
+from django.contrib.admin.apps import SimpleAdminConfig
+from django.contrib.admin.checks import check_admin_app, check_dependencies
+from django.core import checks
+from django.urls import URLResolver
+from django.urls.resolvers import RoutePattern
+from django.utils.module_loading import import_string
+
+
+class LazyAdminConfig(SimpleAdminConfig):
+    """
+    The admin app, without discovering the apps' admin modules at startup.
+    """
+
+    def ready(self):
+        checks.register(check_dependencies, checks.Tags.admin)
+        checks.register(check_discovered_admin, checks.Tags.admin)
+
+
+def check_discovered_admin(app_configs, **kwargs):
+    """Run the admin's system checks once every admin is registered."""
+    autodiscover()
+    return check_admin_app(app_configs, **kwargs)
+
+
+class LazyURLResolver(URLResolver):
+    """
+    A namespaced resolver that imports its URLconf only when one of its own
+    URLs is resolved or reversed.
+    """
+
+    def _populate(self):
+        # Django populates every resolver the first time any URL is
+        # reversed. A namespace's URLs are only looked up through the
+        # namespace, which loads `url_patterns` first, so this can wait.
+        # This overrides a private method of Django 4.2's URLResolver, so
+        # blog/test_urls.py checks the admin URLs in a fresh process.
+        if "url_patterns" in self.__dict__:
+            super()._populate()
+
+
+def lazy_include(route, urlconf, namespace):
+    """
+    Return a URL pattern that includes the URLconf module named `urlconf`
+    under `namespace`, importing it only when it's first used.
+
+    Args:
+        route (str): The URL prefix, like the `route` of `path()`.
+        urlconf (str): The dotted path of the URLconf module.
+        namespace (str): The application and instance namespace.
+
+    Returns:
+        LazyURLResolver: The pattern.
+    """
+    return LazyURLResolver(
+        RoutePattern(route, is_endpoint=False),
+        urlconf,
+        app_name=namespace,
+        namespace=namespace,
+    )
+
+
+def lazy_view(dotted_path):
+    """
+    Return a view that imports a class-based view when it's first called.
+
+    The view class's dotted path is kept in the view's `view_path`.
+
+    Args:
+        dotted_path (str): The dotted path of the view class.
+
+    Returns:
+        callable: The view function.
+    """
+    view = None
+
+    def wrapper(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(dotted_path).as_view()
+        return view(request, *args, **kwargs)
+
+    wrapper.view_path = dotted_path
+    return wrapper
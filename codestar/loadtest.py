@@ -0,0 +1,120 @@
+"""
+Helpers for the benchmark commands that load test the site under gunicorn.
+
+The server runs in a subprocess, so it uses the database and settings of the
+command's environment, and requests are sent over real sockets by asyncio
+clients in the command's process.
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.management.base import CommandError
+
+# Seconds to wait for a server to accept connections.
+STARTUP_TIMEOUT = 30
+
+
+def free_port():
+    """Return a local TCP port that nothing is listening on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def gunicorn(*args, env=None):
+    """
+    Run gunicorn on a free port until the block ends.
+
+    The page cache is turned off so that every request reaches the views.
+
+    Args:
+        *args (str): Gunicorn's command line arguments, without `--bind`.
+        env (dict): Environment variables to set for the server.
+
+    Raises:
+        CommandError: If the server doesn't start.
+
+    Yields:
+        tuple: The server's `Popen` and its port.
+    """
+    port = free_port()
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        f"--bind=127.0.0.1:{port}",
+        *args,
+    ]
+    env = {**os.environ, "PAGE_CACHE_TIMEOUT": "0", **(env or {})}
+    with tempfile.TemporaryFile() as log:
+        server = subprocess.Popen(
+            command,
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        try:
+            _wait_for(server, port, log)
+            yield server, port
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def _wait_for(server, port, log):
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            log.seek(0)
+            output = log.read().decode(errors="replace")
+            raise CommandError(f"The server didn't start:\n{output}")
+        try:
+            socket.create_connection(("127.0.0.1", port), 1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise CommandError(
+        f"The server didn't start within {STARTUP_TIMEOUT} seconds."
+    )
+
+
+async def get(port, path, start=0, delay=0):
+    """
+    Wait `start` seconds, then send a GET request that takes `delay` seconds
+    to arrive, like a client on a slow connection, and read the response.
+
+    Returns:
+        tuple: The response's status code and the seconds it took.
+    """
+    await asyncio.sleep(start)
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+        "Connection: close\r\n".encode()
+    )
+    await writer.drain()
+    await asyncio.sleep(delay)
+    writer.write(b"\r\n")
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    status = int(status_line.split()[1]) if status_line else 0
+    return status, time.perf_counter() - started
+
+
+def percentile(values, percent):
+    """Return the `percent` percentile of `values`."""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
@@ -0,0 +1,238 @@
+"""
+A full-page cache for anonymous readers.
+
+Cached pages are keyed on a content version number that is bumped whenever a
+watched model is saved or deleted, so a change to any post, comment or About
+content makes every cached page stale at once. The version lives in the same
+cache as the pages, so every worker sharing the cache sees the new version.
+Keys also include the build ID, so pages cached before a deploy aren't served
+after it.
+"""
+
+import hashlib
+import os
+from functools import lru_cache, wraps
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.contrib.messages.storage.session import SessionStorage
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import parse_http_date_safe
+
+CACHE_ALIAS = "pages"
+VERSION_KEY = "page_cache:version"
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+@lru_cache(maxsize=None)
+def build_id():
+    """
+    Return an identifier of the deployed templates and static files.
+
+    It's the deployed commit from Heroku's `HEROKU_SLUG_COMMIT`, set when the
+    runtime dyno metadata feature is on, or else a hash of the static files
+    manifest, which changes whenever a fingerprinted file name does.
+
+    Returns:
+        str: The identifier, or "" if neither is available.
+    """
+    commit = os.environ.get("HEROKU_SLUG_COMMIT")
+    if commit:
+        return commit
+    read_manifest = getattr(staticfiles_storage, "read_manifest", None)
+    manifest = read_manifest() if read_manifest else None
+    if not manifest:
+        return ""
+    return hashlib.md5(manifest.encode(), usedforsecurity=False).hexdigest()
+
+
+def content_version():
+    """
+    Return the current content version number.
+
+    Returns:
+        int: The version number.
+    """
+    return _cache().get_or_set(VERSION_KEY, 1, timeout=None)
+
+
+def bump_content_version(**kwargs):
+    """
+    Make every cached page stale.
+
+    Accepts and ignores signal arguments, so it can be used as a receiver.
+    """
+    cache = _cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 2, timeout=None)
+
+
+def watch_models(*models):
+    """
+    Bump the content version whenever an instance of `models` is saved or
+    deleted.
+
+    Args:
+        *models (Model): The model classes that change page content.
+    """
+    for model in models:
+        uid = f"page_cache:{model._meta.label}"
+        post_save.connect(bump_content_version, sender=model, dispatch_uid=uid)
+        post_delete.connect(
+            bump_content_version, sender=model, dispatch_uid=uid
+        )
+
+
+def has_pending_messages(request):
+    """
+    Return True if the request carries flash messages waiting to be shown.
+    """
+    if CookieStorage.cookie_name in request.COOKIES:
+        return True
+    if settings.SESSION_COOKIE_NAME in request.COOKIES:
+        return SessionStorage.session_key in request.session
+    return False
+
+
+async def auser(request):
+    """
+    Load the request's user in a worker thread and return it.
+
+    The user is loaded from the session the first time it's used, which may
+    query the database, so async views must load it with this first. Once
+    loaded, `request.user` and `request.session` are safe to use anywhere.
+
+    Args:
+        request (HttpRequest): The request being handled by an async view.
+
+    Returns:
+        User or AnonymousUser: The request's user.
+    """
+
+    def load():
+        # Reading any attribute evaluates the lazy user object.
+        request.user.is_authenticated
+        return request.user
+
+    return await sync_to_async(load)()
+
+
+def _is_cacheable(request):
+    """
+    Return True if the response to `request` may be served from the cache.
+    """
+    return (
+        settings.PAGE_CACHE_TIMEOUT > 0
+        and request.method in ("GET", "HEAD")
+        and not request.user.is_authenticated
+        and not has_pending_messages(request)
+    )
+
+
+def _page_key(request, version):
+    url = request.build_absolute_uri()
+    digest = hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()
+    return f"page_cache:{build_id()}:{version}:{digest}"
+
+
+def _conditional_cached_response(request, response):
+    """
+    Return a cached response, or 304 if the client's copy is current.
+    """
+    return get_conditional_response(
+        request,
+        etag=response.get("ETag"),
+        last_modified=parse_http_date_safe(response.get("Last-Modified", "")),
+        response=response,
+    )
+
+
+def _may_store_now(response, store):
+    """
+    Return True if `response` may be cached now.
+
+    Template responses that may be cached are passed to `store` once they're
+    rendered instead.
+    """
+    patch_vary_headers(response, ("Cookie",))
+    if response.status_code != 200 or response.cookies:
+        return False
+    if hasattr(response, "render") and callable(response.render):
+        response.add_post_render_callback(store)
+        return False
+    return True
+
+
+def cache_anonymous_page(view):
+    """
+    Decorate a view so that anonymous readers are served cached pages.
+
+    Authenticated users, requests other than GET and HEAD, and requests
+    carrying flash messages always reach the view. Only successful responses
+    that don't set cookies are cached. Cached responses carrying an ETag or
+    Last-Modified header answer matching conditional requests with 304.
+
+    Args:
+        view (callable): A view function.
+
+    Returns:
+        callable: The decorated view. It's async if `view` is.
+    """
+    if iscoroutinefunction(view):
+        return _async_cache_anonymous_page(view)
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not _is_cacheable(request):
+            return view(request, *args, **kwargs)
+        key = _page_key(request, content_version())
+        cache = _cache()
+        response = cache.get(key)
+        if response is not None:
+            return _conditional_cached_response(request, response)
+        response = view(request, *args, **kwargs)
+
+        def store(response):
+            cache.set(key, response, settings.PAGE_CACHE_TIMEOUT)
+
+        if _may_store_now(response, store):
+            store(response)
+        return response
+
+    return wrapper
+
+
+def _async_cache_anonymous_page(view):
+    """
+    The async version of :func:`cache_anonymous_page`, for async views.
+    """
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        await auser(request)
+        if not _is_cacheable(request):
+            return await view(request, *args, **kwargs)
+        cache = _cache()
+        version = await cache.aget_or_set(VERSION_KEY, 1, timeout=None)
+        key = _page_key(request, version)
+        response = await cache.aget(key)
+        if response is not None:
+            return _conditional_cached_response(request, response)
+        response = await view(request, *args, **kwargs)
+
+        def store(response):
+            cache.set(key, response, settings.PAGE_CACHE_TIMEOUT)
+
+        if _may_store_now(response, store):
+            await cache.aset(key, response, settings.PAGE_CACHE_TIMEOUT)
+        return response
+
+    return wrapper
@@ -0,0 +1,180 @@
+"""
+Token-bucket rate limits for form submissions.
+
+Each client gets a bucket per scope in `settings.RATE_LIMITS`. A bucket holds
+up to `capacity` tokens and refills at `capacity` tokens per `period` seconds.
+Every limited request takes a token, and a request that finds its bucket
+empty gets a 429 response before the view, its forms or the ORM run.
+
+`settings.RATE_LIMIT_BACKEND` picks where buckets are kept. `LocalBuckets`
+keeps them in the worker's memory. `CacheBuckets` keeps them in the
+"ratelimit" cache, which is shared by every worker when it uses the file or
+database cache backends.
+"""
+
+import math
+import threading
+import time
+from functools import wraps
+from http import HTTPStatus
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+
+CACHE_ALIAS = "ratelimit"
+
+
+def _refill(state, capacity, period, now):
+    """
+    Return a bucket's token count at `now`.
+
+    Args:
+        state (tuple): The stored token count and when it was stored, or
+            None for a new bucket.
+        capacity (int): The most tokens the bucket holds.
+        period (float): The seconds taken to refill an empty bucket.
+        now (float): The current time in seconds.
+
+    Returns:
+        float: The number of tokens in the bucket.
+    """
+    if state is None:
+        return capacity
+    tokens, stamp = state
+    return min(capacity, tokens + (now - stamp) * capacity / period)
+
+
+def _take(state, capacity, period, now):
+    """
+    Take a token from a bucket.
+
+    Returns:
+        tuple:
+            The new bucket state, and the seconds to wait for a token if the
+            bucket was empty, or 0 if a token was taken.
+    """
+    tokens = _refill(state, capacity, period, now)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), (1 - tokens) * period / capacity
+
+
+class LocalBuckets:
+    """
+    Buckets kept in this worker's memory.
+
+    Each worker limits clients on its own, so a client may make up to one
+    bucket's worth of requests per worker.
+    """
+
+    # Forget full buckets once this many are held, scanning for them at
+    # most once every PRUNE_INTERVAL seconds so that a worker holding many
+    # refilling buckets doesn't scan them all on every request.
+    MAX_BUCKETS = 10000
+    PRUNE_INTERVAL = 60
+
+    # Maps each key to its bucket's state and period.
+    _buckets = {}
+    _lock = threading.Lock()
+    # When the buckets were last scanned.
+    _pruned_at = -math.inf
+
+    def take(self, key, capacity, period):
+        now = time.monotonic()
+        with self._lock:
+            if (
+                len(self._buckets) >= self.MAX_BUCKETS
+                and now - self._pruned_at >= self.PRUNE_INTERVAL
+            ):
+                self._prune(now)
+            state, _ = self._buckets.get(key, (None, period))
+            state, wait = _take(state, capacity, period, now)
+            self._buckets[key] = (state, period)
+        return wait
+
+    def _prune(self, now):
+        """Forget the buckets that have had time to refill."""
+        LocalBuckets._pruned_at = now
+        for key, ((_, stamp), period) in list(self._buckets.items()):
+            if now - stamp >= period:
+                del self._buckets[key]
+
+
+class CacheBuckets:
+    """
+    Buckets kept in the "ratelimit" cache, shared by every worker using it.
+
+    Reading and writing a bucket isn't atomic, so clients racing themselves
+    across workers may get a request or two more than their limit.
+    """
+
+    def take(self, key, capacity, period):
+        cache = caches[CACHE_ALIAS]
+        now = time.time()
+        state, wait = _take(cache.get(key), capacity, period, now)
+        cache.set(key, state, timeout=math.ceil(period))
+        return wait
+
+
+def get_backend():
+    """Return an instance of the backend in `settings.RATE_LIMIT_BACKEND`."""
+    return import_string(settings.RATE_LIMIT_BACKEND)()
+
+
+def client_key(request):
+    """
+    Return the key identifying the client that made `request`.
+
+    Logged in users are identified by their ID, so they keep one bucket
+    across addresses. Anonymous visitors are identified by their IP address,
+    read from X-Forwarded-For when `settings.RATE_LIMIT_PROXIES` trusted
+    proxies sit in front of the site.
+
+    Returns:
+        str: The client's key.
+    """
+    if request.user.is_authenticated:
+        return f"user:{request.user.pk}"
+    address = request.META.get("REMOTE_ADDR", "")
+    proxies = settings.RATE_LIMIT_PROXIES
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR")
+    if proxies and forwarded:
+        hops = [hop.strip() for hop in forwarded.split(",")]
+        address = hops[max(0, len(hops) - proxies)]
+    return f"ip:{address}"
+
+
+def rate_limit(scope, methods=("POST",)):
+    """
+    Return a decorator that limits a view's `methods` requests per client.
+
+    Args:
+        scope (str): A key of `settings.RATE_LIMITS`, which maps it to the
+            `(capacity, period)` of each client's bucket.
+        methods (iterable): The HTTP methods that take a token.
+
+    Returns:
+        callable: A view decorator.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if settings.RATE_LIMIT_ENABLED and request.method in methods:
+                capacity, period = settings.RATE_LIMITS[scope]
+                key = f"ratelimit:{scope}:{client_key(request)}"
+                wait = get_backend().take(key, capacity, period)
+                if wait:
+                    response = HttpResponse(
+                        "Too many requests. Please try again later.",
+                        content_type="text/plain",
+                        status=HTTPStatus.TOO_MANY_REQUESTS,
+                    )
+                    response["Retry-After"] = str(math.ceil(wait))
+                    return response
+            return view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
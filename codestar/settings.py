@@ -15,6 +15,7 @@ from django.contrib.messages import constants as messages_constants
 import os
 from pathlib import Path
 import sys
+import tempfile
 
 if os.path.isfile("env.py"):
     import env  # noqa: F401 - Ignore unreferenced import warning
@@ -42,7 +43,7 @@ ALLOWED_HOSTS = [
 
 # cloudinary_storage must be immediately after django.contrib.staticfiles
 INSTALLED_APPS = [
-    "django.contrib.admin",
+    "codestar.lazy_admin.LazyAdminConfig",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.messages",
@@ -111,8 +112,126 @@ WSGI_APPLICATION = "codestar.wsgi.application"
 # }
 DATABASES = {"default": dj_database_url.parse(os.environ.get("DATABASE_URL"))}
 
+# Each worker thread keeps its connection for DATABASE_CONN_MAX_AGE seconds
+# instead of opening one per request, and checks it still works before
+# reusing it in a new request. Set DATABASE_POOLER to "transaction" when
+# connecting through a transaction-pooling PgBouncer, which can't keep
+# server-side cursors open between transactions. codestar/asgi.py sets it to
+# 0, because ASGI requests can't reuse a connection.
+DATABASES["default"].update(
+    {
+        "CONN_MAX_AGE": int(os.environ.get("DATABASE_CONN_MAX_AGE", 600)),
+        "CONN_HEALTH_CHECKS": (
+            os.environ.get("DATABASE_CONN_HEALTH_CHECKS", "True") == "True"
+        ),
+        "DISABLE_SERVER_SIDE_CURSORS": (
+            os.environ.get("DATABASE_POOLER") == "transaction"
+        ),
+    }
+)
+if "postgresql" in DATABASES["default"]["ENGINE"]:
+    DATABASES["default"].setdefault("OPTIONS", {})["connect_timeout"] = int(
+        os.environ.get("DATABASE_CONNECT_TIMEOUT", 5)
+    )
+
 if "test" in sys.argv:
     DATABASES["default"]["ENGINE"] = "django.db.backends.sqlite3"
+    DATABASES["default"]["OPTIONS"] = {}
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+# The "pages" cache holds full pages for anonymous readers and the markers
+# that tell workers when content has changed. The default file backend is
+# shared by every worker on a dyno and needs no external service.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "pages": {
+        "BACKEND": os.environ.get(
+            "PAGE_CACHE_BACKEND",
+            "django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": os.environ.get(
+            "PAGE_CACHE_LOCATION",
+            os.path.join(tempfile.gettempdir(), "codestar_page_cache"),
+        ),
+    },
+    "ratelimit": {
+        "BACKEND": os.environ.get(
+            "RATE_LIMIT_CACHE_BACKEND",
+            "django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": os.environ.get(
+            "RATE_LIMIT_CACHE_LOCATION",
+            os.path.join(tempfile.gettempdir(), "codestar_ratelimit"),
+        ),
+    },
+    "sessions": {
+        "BACKEND": os.environ.get(
+            "SESSION_CACHE_BACKEND",
+            "django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": os.environ.get(
+            "SESSION_CACHE_LOCATION",
+            os.path.join(tempfile.gettempdir(), "codestar_sessions"),
+        ),
+    },
+}
+# Seconds to keep a cached page. Set to 0 to turn the page cache off.
+PAGE_CACHE_TIMEOUT = int(os.environ.get("PAGE_CACHE_TIMEOUT", 600))
+# Seconds before each worker rechecks the About content. Changes show at once
+# on servers sharing the "pages" cache and after this long on the others.
+ABOUT_CACHE_TIMEOUT = int(os.environ.get("ABOUT_CACHE_TIMEOUT", 60))
+
+if "test" in sys.argv:
+    CACHES["pages"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "pages",
+    }
+    CACHES["ratelimit"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "ratelimit",
+    }
+    CACHES["sessions"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "sessions",
+    }
+
+# With a shared "sessions" cache, set with SESSION_CACHE_BACKEND, sessions
+# are read from the cache and written through to the database, which is only
+# read when the cache misses. The default file cache is local to each dyno, so
+# a logout on one dyno wouldn't end the cached session on the others, and
+# sessions are then kept in the database only. The tests run in one process,
+# so they use the cache. Flash messages live in a signed cookie, so showing
+# one never reads or writes a session.
+if "SESSION_CACHE_BACKEND" in os.environ or "test" in sys.argv:
+    default_session_engine = "django.contrib.sessions.backends.cached_db"
+else:
+    default_session_engine = "django.contrib.sessions.backends.db"
+SESSION_ENGINE = os.environ.get("SESSION_ENGINE", default_session_engine)
+SESSION_CACHE_ALIAS = "sessions"
+MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
+
+# Token buckets for form submissions: each client may make `capacity`
+# requests in a burst, refilled over `period` seconds. Use
+# "codestar.ratelimit.LocalBuckets" to keep buckets in each worker's memory.
+RATE_LIMIT_ENABLED = (
+    os.environ.get("RATE_LIMIT_ENABLED", "True") == "True"
+    and "test" not in sys.argv
+)
+RATE_LIMIT_BACKEND = os.environ.get(
+    "RATE_LIMIT_BACKEND", "codestar.ratelimit.CacheBuckets"
+)
+RATE_LIMITS = {
+    "comment": (5, 60),
+    "collaborate": (3, 600),
+}
+# The number of proxies in front of the site that append the client's address
+# to X-Forwarded-For. Heroku's router is one. Set it to 0 when clients connect
+# directly, or they can pick their own address.
+RATE_LIMIT_PROXIES = int(os.environ.get("RATE_LIMIT_PROXIES", 1))
 
 CSRF_TRUSTED_ORIGINS = [
     "https://*.codeinstitute-ide.net/",
@@ -143,6 +262,30 @@ AUTH_PASSWORD_VALIDATORS = [
 
 ACCOUNT_EMAIL_VERIFICATION = "none"
 
+# Paginate the home page with "keyset" cursors, which skip the COUNT query and
+# keep deep pages fast, or with numbered "offset" pages.
+POST_LIST_PAGINATION = os.environ.get("POST_LIST_PAGINATION", "keyset")
+
+# Save collaboration requests from a spool file in batches instead of during
+# the request. A background thread drains the spool at most once per
+# COLLABORATE_FLUSH_INTERVAL seconds; 0 leaves it to the
+# "drain_collaborate_spool" command.
+COLLABORATE_WRITE_BEHIND = (
+    os.environ.get("COLLABORATE_WRITE_BEHIND", "False") == "True"
+)
+COLLABORATE_SPOOL_PATH = os.environ.get(
+    "COLLABORATE_SPOOL_PATH",
+    os.path.join(BASE_DIR, "spool", "collaborate_requests.jsonl"),
+)
+COLLABORATE_FLUSH_INTERVAL = float(
+    os.environ.get("COLLABORATE_FLUSH_INTERVAL", 2)
+)
+
+# Serve the read views with async views that use the async ORM. The ASGI
+# application turns this on, so it only applies under ASGI workers. See
+# codestar/gunicorn_config.py.
+ASYNC_READ_VIEWS = os.environ.get("ASYNC_READ_VIEWS", "False") == "True"
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -164,6 +307,33 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 
+# collectstatic minifies, fingerprints and compresses static files, and
+# WhiteNoise serves the fingerprinted files with immutable cache headers.
+# Tests use the plain storage, so they don't need collectstatic to run first.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "codestar.storage.MinifiedCompressedManifestStorage",
+    },
+}
+
+if "test" in sys.argv:
+    STORAGES["staticfiles"] = {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    }
+
+# Uploaded media, used by the local image backend.
+MEDIA_URL = "media/"
+MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+
+# Makes the responsive derivatives of uploaded images. Use
+# "codestar.images.LocalImageBackend" to work without Cloudinary.
+IMAGE_BACKEND = os.environ.get(
+    "IMAGE_BACKEND", "codestar.images.CloudinaryImageBackend"
+)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,75 @@
+"""
+Static file storage that minifies, fingerprints and compresses assets.
+
+`collectstatic` minifies the project's own CSS and JavaScript, then WhiteNoise
+adds a content hash to every file name and writes gzip and brotli copies.
+WhiteNoise serves files with hashed names with a `Cache-Control` header that
+lets browsers cache them forever.
+"""
+
+import os
+from importlib import import_module
+from django.contrib.staticfiles.finders import FileSystemFinder
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+MINIFIERS = {
+    ".css": ("rcssmin", "cssmin"),
+    ".js": ("rjsmin", "jsmin"),
+}
+
+
+def project_static_files():
+    """
+    Return the names of the static files in `settings.STATICFILES_DIRS`.
+
+    Returns:
+        set: The files' names relative to `STATIC_ROOT`.
+    """
+    return {name for name, _ in FileSystemFinder().list([])}
+
+
+def minify(name, source):
+    """
+    Return a minified copy of a CSS or JavaScript file's source.
+
+    Args:
+        name (str): The file's name, which picks the minifier.
+        source (str): The file's contents.
+
+    Returns:
+        str: The minified source, or `source` if it isn't CSS or JavaScript.
+    """
+    extension = os.path.splitext(name)[1]
+    if extension not in MINIFIERS or ".min." in name:
+        return source
+    module_name, function_name = MINIFIERS[extension]
+    return getattr(import_module(module_name), function_name)(source)
+
+
+class MinifiedCompressedManifestStorage(CompressedManifestStaticFilesStorage):
+    """
+    WhiteNoise's compressed manifest storage, minifying the project's own CSS
+    and JavaScript before they are hashed.
+
+    Third-party files, such as the admin's, are left as their authors ship
+    them.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            paths = dict(paths)
+            for name in paths.keys() & project_static_files():
+                if os.path.splitext(name)[1] in MINIFIERS:
+                    self._minify_file(name)
+                    # Hash the minified copy instead of the source file.
+                    paths[name] = (self, name)
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+    def _minify_file(self, name):
+        path = self.path(name)
+        with open(path, encoding="utf-8") as file:
+            source = file.read()
+        minified = minify(name, source)
+        if minified != source:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(minified)
@@ -15,13 +15,38 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
-from django.contrib import admin
+from django.conf import settings
+from django.conf.urls.static import static
 from django.urls import include, path
+from django_summernote.utils import get_config
+from .lazy_admin import lazy_include, lazy_view
+
+# The Summernote editor's URLs, with views imported when first used. A copy
+# of django_summernote.urls in django-summernote 0.8.20.0, which is pinned in
+# requirements.txt; blog/test_urls.py checks that they still match.
+summernote_patterns = [
+    path(
+        "editor/<id>/",
+        lazy_view("django_summernote.views.SummernoteEditor"),
+        name="django_summernote-editor",
+    ),
+]
+if not get_config()["disable_attachment"]:
+    summernote_patterns.append(
+        path(
+            "upload_attachment/",
+            lazy_view("django_summernote.views.SummernoteUploadAttachment"),
+            name="django_summernote-upload_attachment",
+        )
+    )
 
 urlpatterns = [
     path("about/", include("about.urls")),
     path("accounts/", include("allauth.urls")),
-    path("admin/", admin.site.urls),
-    path("summernote", include("django_summernote.urls")),
+    lazy_include("admin/", "codestar.admin_urls", "admin"),
+    path("summernote", include(summernote_patterns)),
     path("", include("blog.urls")),
 ]
+
+# Serve local image derivatives in development.
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,3 +1,6 @@
+const deleteModalElement = document.getElementById("deleteModal");
+const deleteModal = new bootstrap.Modal(deleteModalElement);
+
 /**
  * Add event listeners to handle Edit Comment button clicks.
  *
@@ -5,9 +8,11 @@
  * selected comment, and updates the form to send data to the edit comment view.
  *
  * Used in page_details.html.
+ *
+ * @param {ParentNode} root - The element containing the Edit buttons.
  */
-function addEditEventListeners() {
-    const editButtons = document.getElementsByClassName("btn-edit");
+function addEditEventListeners(root = document) {
+    const editButtons = root.getElementsByClassName("btn-edit");
     const commentTextField = document.getElementById("id_body");
     const commentForm = document.getElementById("commentForm");
     const submitButton = document.getElementById("submitButton");
@@ -32,12 +37,11 @@ function addEditEventListeners() {
  * The delete modal is then shown.
  *
  * Used in page_details.html.
+ *
+ * @param {ParentNode} root - The element containing the Delete buttons.
  */
-function addDeleteEventListeners() {
-    const deleteModal = new bootstrap.Modal(
-        document.getElementById("deleteModal")
-    );
-    const deleteBtns = document.getElementsByClassName("btn-delete");
+function addDeleteEventListeners(root = document) {
+    const deleteBtns = root.getElementsByClassName("btn-delete");
     const confirmDeleteBtn = document.getElementById("deleteConfirm");
     for (const deleteBtn of deleteBtns) {
         deleteBtn.addEventListener("click", function (e) {
@@ -48,5 +52,47 @@ function addDeleteEventListeners() {
     }
 }
 
+/**
+ * Add an event listener to handle Load Older Comments button clicks.
+ *
+ * The event handler fetches the next page of older comments from the comment
+ * page view, appends them to the comment list and wires up their Edit and
+ * Delete buttons. The button is removed when there are no older comments.
+ *
+ * Used in page_details.html.
+ */
+function addLoadMoreEventListener() {
+    const loadMoreButton = document.getElementById("loadMoreComments");
+    const commentList = document.getElementById("commentList");
+    if (!loadMoreButton) {
+        return;
+    }
+    loadMoreButton.addEventListener("click", async function () {
+        const url = loadMoreButton.getAttribute("data-url");
+        const cursor = loadMoreButton.getAttribute("data-cursor");
+        loadMoreButton.disabled = true;
+        const response = await fetch(
+            `${url}?before=${encodeURIComponent(cursor)}`
+        );
+        if (!response.ok) {
+            loadMoreButton.disabled = false;
+            return;
+        }
+        const page = await response.json();
+        const olderComments = document.createElement("div");
+        olderComments.innerHTML = page.html;
+        addEditEventListeners(olderComments);
+        addDeleteEventListeners(olderComments);
+        commentList.append(...olderComments.children);
+        if (page.next_cursor) {
+            loadMoreButton.setAttribute("data-cursor", page.next_cursor);
+            loadMoreButton.disabled = false;
+        } else {
+            loadMoreButton.remove();
+        }
+    });
+}
+
 addEditEventListeners();
 addDeleteEventListeners();
+addLoadMoreEventListener();